@@ -1,15 +1,23 @@
 # In backend/app/api/hums.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
-import os
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import StreamingResponse
+import json
 import uuid
-from datetime import datetime
+from typing import List
 from pydub import AudioSegment
-import io
 
 # Import your services and middleware
 from ..services.firebase_service import firebase_service
-from ..services.song_matcher import song_matcher
+from ..services.hum_batch import hum_batch
+from ..services.hum_pipeline import hum_pipeline
+from ..services.job_queue import job_queue, JobQueueFull
+from ..services.metrics import stage
+from ..services.remix_cache import remix_cache
+from ..services.remix_engine import render_decoded, render_remix, MAX_PITCH_SEMITONES, MIN_SPEED, MAX_SPEED
+from ..services.storage_manager import storage_manager, UPLOADS_DIR
+from ..services.transcoder import transcoder, TranscoderBusy
+from ..services.upload_ingest import spool_batch, spool_upload, InvalidBatch, UploadTooLarge
 from ..auth.middleware import get_current_user
 from ..config import settings
 
@@ -21,6 +29,7 @@ router = APIRouter()
 
 @router.post("/upload-and-match")
 async def upload_and_match_hum(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     audio_file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
@@ -29,58 +38,155 @@ async def upload_and_match_hum(
     This is your complete, working song identification endpoint.
     It converts the audio, gets matches from ACRCloud, and saves the result.
     """
-    content = await audio_file.read()
-    file_location = None
+    upload = None
     
     try:
-        # Convert audio to a standard WAV format for accurate matching
-        sound = AudioSegment.from_file(io.BytesIO(content))
-        sound = sound.set_channels(1).set_frame_rate(44100).set_sample_width(2)
-        
-        unique_filename = f"{uuid.uuid4()}.wav"
-        file_location = f"static/uploads/{unique_filename}"
-        os.makedirs("static/uploads", exist_ok=True)
-        sound.export(file_location, format="wav")
-        
-        # Get matches from ACRCloud using the local file
-        matches = await song_matcher.match_hum_by_file(file_location)
-        
-        best_match = matches[0] if matches else None
-        
-        # Ensure user profile exists before updating stats
-        user_profile = await firebase_service.get_user_profile(current_user["uid"])
-        if not user_profile:
-            await firebase_service.create_or_update_user(current_user["uid"], {
-                "email": current_user.get("email"), "name": current_user.get("name")
-            })
-
-        # Save hum data to Firestore
-        hum_data = {
-            "userId": current_user["uid"], "username": current_user.get("name", "Anonymous"),
-            "title": title, "audioUrl": "", "fileSize": os.path.getsize(file_location),
-            "audioFormat": "wav", "processingStatus": "completed" if best_match else "no_match",
-            "isPublic": True, "likes": 0, "likedBy": [], "commentsCount": 0,
-            "matchedSong": best_match, "matchConfidence": best_match['confidence'] if best_match else 0,
-            "createdAt": datetime.utcnow().isoformat()
-        }
-        hum_id = await firebase_service.create_hum(hum_data)
-        
-        # Update user stats
-        await firebase_service.increment_user_stat(current_user["uid"], "totalHums")
-        if best_match:
-            await firebase_service.increment_user_stat(current_user["uid"], "songsIdentified")
+        # Stream the upload to a temp file instead of reading it into memory
+        upload = await spool_upload(audio_file)
 
-        return {
-            "hum_id": hum_id, "title": title, "matches": matches,
-            "processing_status": "completed" if best_match else "no_match",
-        }
+        # Transcode and identify while the user's profile is looked up;
+        # the hum itself is committed after the response goes out.
+        return await hum_pipeline.run(
+            upload.path, title, current_user,
+            schedule_background=background_tasks.add_task,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TranscoderBusy as e:
+        raise HTTPException(
+            status_code=503, detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         print(f"ERROR in /upload-and-match: {e}")
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         # Clean up the temporary file
-        if file_location and os.path.exists(file_location):
-            os.remove(file_location)
+        if upload:
+            upload.cleanup()
+
+
+@router.post("/jobs", status_code=202)
+async def create_identify_job(
+    request: Request,
+    title: str = Form(...),
+    audio_file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Queues the same transcode -> match -> persist steps as /upload-and-match
+    and returns a job ID straight away. Poll /jobs/{job_id} or subscribe to
+    /jobs/{job_id}/events for the result.
+    """
+    upload = None
+
+    try:
+        upload = await spool_upload(audio_file)
+        # The job owns the spooled file from here and deletes it when done
+        job = job_queue.submit(
+            current_user["uid"], hum_pipeline.run,
+            upload.path, title, current_user,
+            cleanup=upload.cleanup,
+        )
+        upload = None
+
+        base_url = str(request.base_url)
+        return {
+            "job_id": job.id, "status": job.status,
+            "status_url": f"{base_url}api/hums/jobs/{job.id}",
+            "events_url": f"{base_url}api/hums/jobs/{job.id}/events",
+        }
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=503, detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except Exception as e:
+        print(f"ERROR in /jobs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if upload:
+            upload.cleanup()
+
+
+@router.post("/batch")
+async def identify_batch(
+    files: List[UploadFile] = File(None),
+    archive: UploadFile = File(None, description="A zip archive of audio files"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Identifies many recordings in one request: any number of `files`
+    and/or a zip `archive`, within the batch limits. Each hum is titled
+    after its file name. Results stream back as NDJSON, one line per file
+    as it finishes, a line per batched Firestore commit, and a summary.
+    """
+    try:
+        uploads = await spool_batch(files or [], archive)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidBatch as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"ERROR in /batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def lines():
+        async for event in hum_batch.run(uploads, current_user):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(
+        lines(), media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _get_owned_job(job_id: str, current_user: dict):
+    job = job_queue.get(job_id, current_user["uid"])
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_identify_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Current status of a job, with its result once it has finished."""
+    return _get_owned_job(job_id, current_user).snapshot()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_identify_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Server-sent events: one `status` event per change, ending when the job finishes."""
+    job = _get_owned_job(job_id, current_user)
+
+    async def events():
+        async for snapshot in job_queue.watch(job, settings.job_events_keepalive_seconds):
+            if snapshot is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: status\ndata: {json.dumps(snapshot)}\n\n"
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/feed")
+async def get_public_feed(
+    limit: int = Query(settings.feed_page_size, ge=1, le=settings.feed_max_page_size),
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+):
+    """Public hums, newest first. Pass next_cursor back to get the following page."""
+    try:
+        return await firebase_service.get_public_feed(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"ERROR loading the public feed: {e}")
+        raise HTTPException(status_code=503, detail="Feed is temporarily unavailable")
 
 
 @router.post("/remix")
@@ -91,55 +197,90 @@ async def remix_hum_endpoint(
     speed: float = Form(1.0),
     reverse: str = Form("false"),
     echo: int = Form(0),
-    reverb: int = Form(0)
+    reverb: int = Form(0),
+    preview: str = Form("false")
 ):
     """
     This is your complete, working remix endpoint.
-    It uses a stable method for speed changes to prevent crashes.
+    The audio is decoded once, every effect is applied to one NumPy buffer,
+    and the result is encoded once, all in the transcoder's worker pool.
+    With preview=true only the first few seconds are rendered, at a lower
+    sample rate and as WAV, so sliders get feedback quickly; the full MP3
+    is only made when the remix is saved.
     """
-    content = await audio_file.read()
-    remixed_file_location = None
+    if abs(pitch) > MAX_PITCH_SEMITONES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Pitch must be between -{MAX_PITCH_SEMITONES} and {MAX_PITCH_SEMITONES} semitones."
+        )
+    if not MIN_SPEED <= speed <= MAX_SPEED:
+        raise HTTPException(status_code=400, detail=f"Speed must be between {MIN_SPEED} and {MAX_SPEED}.")
+
+    upload = None
     
     try:
         print(f"--- REMIXING AUDIO ---")
-        sound = AudioSegment.from_file(io.BytesIO(content))
+        upload = await spool_upload(audio_file)
 
-        # --- APPLY THE REMIX EFFECTS ---
-        
-        if pitch != 0:
-            new_frame_rate = int(sound.frame_rate * (2.0 ** (pitch / 12.0)))
-            sound = sound._spawn(sound.raw_data, overrides={'frame_rate': new_frame_rate})
-
-        # This is the new, stable method for changing speed
-        if speed != 1.0:
-            if speed <= 0:
-                raise ValueError("Speed must be a positive number.")
-            sound = sound.set_frame_rate(int(sound.frame_rate * speed))
-
-        if reverse.lower() == "true":
-            sound = sound.reverse()
-
-        if echo > 0:
-            decay = 1 - (echo / 100 * 0.7)
-            echo_sound = sound - (sound.max_dB * decay)
-            delayed_echo = AudioSegment.silent(duration=150) + echo_sound
-            sound = sound.overlay(delayed_echo)
-            
-        if reverb > 0:
-             sound = sound + (reverb / 20)
-
-        # --- SAVE AND RETURN THE NEW FILE ---
-        unique_filename = f"remix_{uuid.uuid4()}.mp3"
-        remixed_file_location = f"static/uploads/{unique_filename}"
-        os.makedirs("static/uploads", exist_ok=True)
-        
-        sound.export(remixed_file_location, format="mp3")
+        params = {
+            "pitch": pitch, "speed": speed, "reverse": reverse.lower() == "true",
+            "echo": echo, "reverb": reverb, "preview": preview.lower() == "true",
+        }
+        if params["preview"]:
+            audio_format = "wav"
+            render_options = (settings.remix_preview_seconds, settings.remix_preview_sample_rate)
+        else:
+            audio_format = "mp3"
+            render_options = (None, None)
+
+        # Identical audio + settings: reuse the file rendered last time
+        render_key = remix_cache.render_key(upload.sha256, params)
+        unique_filename = remix_cache.get_render(render_key)
+
+        if unique_filename is None:
+            # --- RENDER AND SAVE THE NEW FILE ---
+            prefix = "remix_preview_" if params["preview"] else "remix_"
+            unique_filename = f"{prefix}{uuid.uuid4()}.{audio_format}"
+            remixed_file_location = f"{UPLOADS_DIR}/{unique_filename}"
+
+            source = remix_cache.get_source(upload.sha256)
+            if source is not None:
+                # Same recording, new settings: skip the decode
+                samples, sample_rate = source
+                with stage("remix_render"):
+                    await transcoder.run(
+                        render_decoded, samples, sample_rate, remixed_file_location,
+                        params, audio_format, *render_options
+                    )
+            else:
+                with stage("remix_decode_render"):
+                    result = await transcoder.run(
+                        render_remix, upload.path, remixed_file_location,
+                        params, audio_format, remix_cache.max_source_bytes, *render_options
+                    )
+                if "source" in result:
+                    remix_cache.put_source(upload.sha256, *result["source"])
+
+            remix_cache.put_render(render_key, unique_filename, remixed_file_location)
+
+        # Counts as a use for the storage manager's LRU eviction
+        storage_manager.touch(unique_filename)
 
         base_url = str(request.base_url)
         remixed_url = f"{base_url}static/uploads/{unique_filename}"
         
-        return { "message": "Remix successful!", "remixed_url": remixed_url }
+        return { "message": "Remix successful!", "remixed_url": remixed_url, "preview": params["preview"] }
 
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TranscoderBusy as e:
+        raise HTTPException(
+            status_code=503, detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         print(f"ERROR during remixing: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if upload:
+            upload.cleanup()
@@ -1,7 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
-from ..services.firebase_service import firebase_service
+from .token_cache import token_cache
 
 security = HTTPBearer()
 
@@ -14,7 +14,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
     
     try:
-        user_info = await firebase_service.verify_token(credentials.credentials)
+        user_info = await token_cache.verify(credentials.credentials)
         return user_info
     except Exception as e:
         raise HTTPException(
@@ -30,7 +30,7 @@ async def get_current_user_optional(
         return None
     
     try:
-        user_info = await firebase_service.verify_token(credentials.credentials)
+        user_info = await token_cache.verify(credentials.credentials)
         return user_info
     except:
         return None
\ No newline at end of file
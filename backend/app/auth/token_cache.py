@@ -0,0 +1,66 @@
+# In backend/app/auth/token_cache.py
+
+import asyncio
+import hashlib
+import time
+from typing import Dict
+
+from ..config import settings
+from ..services.firebase_service import firebase_service
+from ..services.metrics import stage
+from ..services.ttl_cache import TTLCache
+
+
+class TokenCache:
+    """
+    Remembers verified Firebase ID tokens until shortly before they expire,
+    so a session's repeated requests skip the signature check and the thread
+    hop. Tokens are keyed by their SHA-256, never stored in the clear.
+    Concurrent requests with the same uncached token share one verification.
+    """
+
+    def __init__(self):
+        self.max_ttl_seconds = settings.token_cache_max_ttl_seconds
+        self.leeway_seconds = settings.token_cache_leeway_seconds
+        self.entries = TTLCache(settings.token_cache_max_entries, self.max_ttl_seconds)
+        self._in_flight: Dict[str, "asyncio.Task[dict]"] = {}
+        self.coalesced = 0
+
+    async def verify(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode()).hexdigest()
+        user_info = self.entries.get(key)
+        if user_info is not None:
+            return user_info
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # Its own task, so a caller that is cancelled (e.g. the client
+            # disconnected) cannot leave the other callers waiting forever
+            task = asyncio.create_task(self._verify(key, token))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[dict]"):
+        self._in_flight.pop(key, None)
+        # Marks a failure as retrieved in case every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def _verify(self, key: str, token: str) -> dict:
+        with stage("token_verify"):
+            claims = await firebase_service.decode_token(token)
+        user_info = firebase_service.user_info_from_claims(claims)
+
+        # Never trust the cache past the token's own expiry
+        ttl = min(claims.get("exp", 0) - time.time(), self.max_ttl_seconds) - self.leeway_seconds
+        self.entries.set(key, user_info, ttl_seconds=ttl)
+        return user_info
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.entries.stats(), "coalesced": self.coalesced}
+
+
+token_cache = TokenCache()
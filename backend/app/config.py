@@ -13,10 +13,93 @@ class Settings(BaseSettings):
     # Firebase
     firebase_credentials_path: str = os.getenv("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
     firebase_project_id: str = os.getenv("FIREBASE_PROJECT_ID", "hummify-fb4d")
+    # Initialize Firebase in the background right after start-up instead of
+    # on the first request that needs it. Start-up itself never waits for it.
+    warm_up_on_startup: bool = True
+    # Print per-stage timings of requests that ran any instrumented stage
+    log_request_timings: bool = True
+
+    # Verified ID token cache (entries also expire at the token's own exp)
+    token_cache_max_entries: int = 10000
+    token_cache_max_ttl_seconds: int = 3600
+    token_cache_leeway_seconds: int = 30
+
+    # Firestore access: "threaded" runs the blocking client in the default
+    # thread pool, "async" uses the native asyncio client over one shared
+    # gRPC channel, "memory" keeps documents in process (local development
+    # and benchmarks; nothing is persisted). Calls beyond the limit wait.
+    firestore_backend: str = "threaded"
+    firestore_max_concurrency: int = 32
+
+    # In-process user profile cache (write-through on updates and stat increments)
+    profile_cache_max_entries: int = 10000
+    profile_cache_ttl_seconds: int = 60
+    # Buffer user counter increments and write merged deltas periodically.
+    # Off by default because it trades durability for fewer writes: with it
+    # on, increments still buffered are lost if the process crashes, and a
+    # new hum is committed without its stat increments instead of in the
+    # same atomic batch. Turn it on only where counters may drift.
+    counter_aggregation_enabled: bool = False
+    counter_flush_interval_seconds: float = 5.0
+    counter_flush_max_pending: int = 400
+    # Public feed (/api/hums/feed): page sizes and the in-process page cache,
+    # which is also cleared whenever this process creates a hum
+    feed_page_size: int = 20
+    feed_max_page_size: int = 50
+    feed_cache_max_entries: int = 256
+    feed_cache_ttl_seconds: int = 10
+    # Commit new hums after the /upload-and-match response has been sent
+    persist_hums_in_background: bool = True
 
     # Audio processing
     max_audio_size_mb: int = 10
     supported_audio_formats: List[str] = ["wav", "mp3", "m4a", "ogg"]
+    # Remix caches: encoded renders (deleted from static/uploads on eviction)
+    # and decoded source audio for parameter-only changes
+    remix_cache_max_entries: int = 256
+    remix_cache_max_mb: int = 200
+    remix_cache_ttl_seconds: int = 3600
+    remix_source_cache_mb: int = 128
+    remix_source_cache_ttl_seconds: int = 900
+    # Remix previews: only the first N seconds, at a lower rate, as plain WAV
+    remix_preview_seconds: float = 8.0
+    remix_preview_sample_rate: int = 22050
+
+    # static/uploads housekeeping: disk budget, TTL for remix outputs, and
+    # how long a spool file may linger before it counts as a crash leftover
+    storage_max_mb: int = 500
+    storage_ttl_seconds: int = 24 * 3600
+    storage_orphan_grace_seconds: int = 15 * 60
+    storage_sweep_interval_seconds: int = 300
+
+    # Where uploads are spooled while being processed (None = system temp dir)
+    upload_spool_dir: Optional[str] = None
+
+    # Transcoding worker pool (0 workers means one per CPU)
+    transcode_workers: int = 0
+    transcode_max_queue: int = 8
+    transcode_retry_after_seconds: int = 5
+
+    # Batch identification (/api/hums/batch): many files or one zip archive.
+    # Transcodes run at most batch_transcode_concurrency at a time (0 means
+    # one per transcoder worker), ACRCloud calls batch_identify_concurrency
+    # at a time, and finished hums are committed batch_commit_size at once.
+    batch_max_items: int = 50
+    batch_max_total_mb: int = 100
+    batch_transcode_concurrency: int = 0
+    batch_identify_concurrency: int = 4
+    batch_commit_size: int = 20
+
+    # Async identification jobs (/api/hums/jobs)
+    job_workers: int = 4
+    job_max_queue: int = 64
+    job_ttl_seconds: int = 900
+    job_max_entries: int = 10000
+    job_retry_after_seconds: int = 5
+    job_events_keepalive_seconds: float = 15.0
+    # On shutdown, how long queued and running jobs may keep going before
+    # the rest are cancelled and marked failed
+    job_shutdown_timeout_seconds: float = 20.0
     
     # --- NEW: ACRCloud Credentials ---
     # These lines read the keys for the new, better recognition service.
@@ -24,6 +107,36 @@ class Settings(BaseSettings):
     acrcloud_access_key: Optional[str] = os.getenv("ACRCLOUD_ACCESS_KEY")
     acrcloud_access_secret: Optional[str] = os.getenv("ACRCLOUD_ACCESS_SECRET")
     # ---------------------------------
+
+    # ACRCloud HTTP client (one pooled client for the whole app)
+    acrcloud_http2: bool = True
+    acrcloud_max_connections: int = 20
+    acrcloud_max_keepalive_connections: int = 10
+    acrcloud_keepalive_expiry: float = 30.0
+    acrcloud_connect_timeout: float = 5.0
+    acrcloud_read_timeout: float = 30.0
+    acrcloud_write_timeout: float = 15.0
+    acrcloud_pool_timeout: float = 5.0
+    acrcloud_max_retries: int = 2
+    acrcloud_retry_backoff_seconds: float = 0.25
+    # Identify sample: ACRCloud only looks at ~10-15 s, and 8 kHz is plenty for a hum
+    acrcloud_sample_seconds: float = 12.0
+    acrcloud_sample_rate: int = 8000
+
+    # Identification result cache, keyed on a hash of the normalized audio
+    match_cache_enabled: bool = True
+    match_cache_max_entries: int = 2048
+    match_cache_ttl_seconds: int = 7 * 24 * 3600
+    match_cache_sqlite_path: Optional[str] = None
+
+    # Song matching: "remote" always asks ACRCloud, "local_first" tries the
+    # local melody index and only calls ACRCloud below the threshold.
+    song_matcher_mode: str = "remote"
+    melody_index_path: Optional[str] = None
+    # Local match confidence is the DTW margin over the background, scaled
+    # so 1.0 is a clear win (see melody_index.FULL_CONFIDENCE_MARGIN); 0.5
+    # sits between unindexed songs or noise (<= 0.08) and indexed excerpts (>= 0.55)
+    local_match_threshold: float = 0.5
     
     # CORS
     allowed_origins: List[str] = [
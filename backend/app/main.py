@@ -1,23 +1,171 @@
 # In backend/app/main.py
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from .config import settings
 from .api import auth, hums
+from .auth.token_cache import token_cache
+from .services.firebase_service import firebase_service
+from .services.job_queue import job_queue
+from .services.match_cache import match_cache
+from .services.metrics import (
+    registry, CallbackGauge, HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS,
+    server_timing_header, start_request_timings,
+)
+from .services.remix_cache import remix_cache
+from .services.song_matcher import song_matcher
+from .services.storage_manager import storage_manager
+from .services.transcoder import transcoder
+from .services.upload_ingest import max_batch_bytes, max_upload_bytes
+
+# Routes that take a single audio upload, and the slack allowed for the
+# other multipart fields and boundaries on top of the audio itself.
+AUDIO_UPLOAD_PATHS = {"/api/hums/upload-and-match", "/api/hums/jobs", "/api/hums/remix"}
+# Routes that take many files, limited as a whole
+BATCH_UPLOAD_PATHS = {"/api/hums/batch"}
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+async def warm_up():
+    """Slow first-use initialization, run after the app is already serving."""
+    try:
+        await firebase_service.warm_up()
+    except Exception as e:
+        print(f"ERROR warming up Firebase: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts and stops long-lived resources shared by all requests."""
+    warm_up_task = asyncio.create_task(warm_up()) if settings.warm_up_on_startup else None
+    await song_matcher.startup()
+    storage_manager.start()
+    job_queue.start()
+    if settings.counter_aggregation_enabled:
+        firebase_service.counters.start()
+    yield
+    if warm_up_task is not None:
+        await warm_up_task
+    await job_queue.stop()
+    # After the jobs, which may still add increments
+    await firebase_service.counters.stop()
+    await storage_manager.stop()
+    await song_matcher.close()
+    transcoder.shutdown()
+    match_cache.close()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     description="Backend API for Hummify - Your Tune Finder",
+    lifespan=lifespan,
 )
 
 # --- FIX: Mount the static directory to serve uploaded files ---
 # This makes the 'static' folder at your project root publicly accessible under the "/static" URL path.
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Add CORS middleware to allow requests from your frontend
+
+def _upload_limit(path: str) -> Optional[Tuple[int, str]]:
+    """The body size limit of an upload route and its 413 message, or None."""
+    if path in AUDIO_UPLOAD_PATHS:
+        return max_upload_bytes(), f"Audio file is larger than the {settings.max_audio_size_mb} MB limit"
+    if path in BATCH_UPLOAD_PATHS:
+        return max_batch_bytes(), f"Batch is larger than the {settings.batch_max_total_mb} MB limit"
+    return None
+
+
+class UploadSizeLimit:
+    """
+    Caps the request body of the upload routes. A declared Content-Length
+    over the limit is answered with 413 before the body is read at all.
+    Otherwise (chunked bodies, or a lying header) the body bytes are counted
+    in `receive` as they arrive, and the request fails with 413 as soon as
+    they pass the limit, instead of after Starlette has spooled it all.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = _upload_limit(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        max_bytes, detail = limit
+        max_body = max_bytes + MULTIPART_OVERHEAD_BYTES
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_body:
+            response = JSONResponse(status_code=413, content={"detail": detail})
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    # Raised inside form parsing, which FastAPI passes through as is
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadSizeLimit)
+
+
+def _route_template(request: Request) -> str:
+    """The matched route's path template, so metric labels stay bounded."""
+    endpoint = request.scope.get("endpoint")
+    for route in app.routes:
+        if getattr(route, "endpoint", None) is endpoint and endpoint is not None:
+            return route.path
+    return "unmatched"
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Records request latency and collects the timings of every stage the
+    request ran. They are returned in a Server-Timing header and, when
+    enabled, printed as one line per request.
+    """
+    timings = start_request_timings()
+    started = time.perf_counter()
+    status = 500
+    with HTTP_IN_FLIGHT.track():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUEST_SECONDS.observe(
+                elapsed, method=request.method, route=_route_template(request), status=str(status)
+            )
+
+    if timings:
+        response.headers["Server-Timing"] = server_timing_header(timings)
+        if settings.log_request_timings:
+            stages = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings.items())
+            print(f"{request.method} {request.url.path} {status} {elapsed * 1000:.1f}ms {stages}")
+    return response
+
+
+# Add CORS middleware to allow requests from your frontend.
+# Added last so it wraps everything, including early 413 responses.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
@@ -40,4 +188,73 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "storage": storage_manager.stats(),
+        "token_cache": token_cache.stats(),
+        "jobs": job_queue.stats(),
+        "counters": firebase_service.counters.stats(),
+        "firestore": firebase_service.store.stats(),
+    }
+
+
+def _cache_stats():
+    caches = {
+        "match": match_cache.stats(),
+        "profile": firebase_service.profile_cache.stats(),
+        "token": token_cache.stats(),
+        **{f"remix_{name}": stats for name, stats in remix_cache.stats().items()},
+    }
+    values = {}
+    for cache, stats in caches.items():
+        values[(cache, "hit")] = stats["hits"]
+        values[(cache, "miss")] = stats["misses"]
+    return values
+
+
+registry.register(CallbackGauge(
+    "hummify_cache_requests_total", "Cache lookups by cache and result.",
+    ["cache", "result"], _cache_stats, type_name="counter",
+))
+registry.register(CallbackGauge(
+    "hummify_transcoder_in_flight", "Jobs running or queued in the transcoder pool.",
+    [], lambda: {(): transcoder.stats()["in_flight"]},
+))
+registry.register(CallbackGauge(
+    "hummify_jobs_queued", "Identification jobs waiting for a worker.",
+    [], lambda: {(): job_queue.stats()["queued"]},
+))
+registry.register(CallbackGauge(
+    "hummify_counter_pending_users", "Users with counter increments not flushed yet.",
+    [], lambda: {(): firebase_service.counters.pending},
+))
+registry.register(CallbackGauge(
+    "hummify_storage_bytes", "Bytes of remix outputs in static/uploads at the last sweep.",
+    [], lambda: {(): storage_manager.stats()["bytes"]},
+))
+registry.register(CallbackGauge(
+    "hummify_storage_files", "Remix outputs in static/uploads at the last sweep.",
+    [], lambda: {(): storage_manager.stats()["files"]},
+))
+registry.register(CallbackGauge(
+    "hummify_storage_removed_files_total", "Files removed by the storage sweeper, by reason.",
+    ["reason"], lambda: {
+        ("evicted",): storage_manager.stats()["evicted_files"],
+        ("expired",): storage_manager.stats()["expired_files"],
+        ("orphan",): storage_manager.stats()["orphans_removed"],
+    }, type_name="counter",
+))
+registry.register(CallbackGauge(
+    "hummify_storage_evicted_bytes_total", "Bytes freed by evicting remix outputs over the disk budget.",
+    [], lambda: {(): storage_manager.stats()["evicted_bytes"]}, type_name="counter",
+))
+registry.register(CallbackGauge(
+    "hummify_firestore_in_flight", "Firestore calls currently running, by backend.",
+    ["backend"], lambda: {(firebase_service.store.name,): firebase_service.store.in_flight},
+))
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text-format metrics"""
+    return Response(registry.render(), media_type=registry.content_type)
\ No newline at end of file
@@ -1,3 +1,6 @@
+import asyncio
+import functools
+import io
 import librosa
 import numpy as np
 import soundfile as sf
@@ -7,6 +10,149 @@ import tempfile
 import os
 from ..config import settings
 
+# librosa's defaults, which every feature below was originally computed with
+N_FFT = 2048
+HOP_LENGTH = 512
+
+
+@functools.lru_cache(maxsize=8)
+def mel_filterbank(sr: int) -> np.ndarray:
+    """The mel filterbank for sr (about 3 ms to build), made once per sample rate."""
+    return librosa.filters.mel(sr=sr, n_fft=N_FFT)
+
+
+def extract_features(audio_data: np.ndarray, sr: int) -> Dict[str, Any]:
+    """
+    Song matching features from a single STFT. The magnitude spectrogram
+    feeds the spectral centroid and rolloff, its power the chroma and the
+    mel spectrogram, and the mel spectrogram (in dB) both the MFCCs and the
+    onset envelope for beat tracking. Each librosa call used to compute its
+    own STFT from the signal; the values are the same. Zero crossings and
+    RMS are cheap time-domain measures and still use the samples.
+    Blocking and CPU-bound.
+    """
+    features = {}
+
+    try:
+        magnitude = np.abs(librosa.stft(audio_data, n_fft=N_FFT, hop_length=HOP_LENGTH))
+        power = magnitude ** 2
+        mel_db = librosa.power_to_db(mel_filterbank(sr).dot(power))
+
+        # Spectral features
+        spectral_centroids = librosa.feature.spectral_centroid(S=magnitude, sr=sr)[0]
+        features["spectral_centroid_mean"] = float(np.mean(spectral_centroids))
+        features["spectral_centroid_std"] = float(np.std(spectral_centroids))
+
+        # Tempo and beat (beat_track's own onset envelope aggregates with the median)
+        onset_envelope = librosa.onset.onset_strength(S=mel_db, sr=sr, aggregate=np.median)
+        tempo, beats = librosa.beat.beat_track(onset_envelope=onset_envelope, sr=sr, hop_length=HOP_LENGTH)
+        features["tempo"] = float(np.atleast_1d(tempo)[0])
+        features["beat_count"] = len(beats)
+
+        # Chroma features (pitch classes)
+        chroma = librosa.feature.chroma_stft(S=power, sr=sr)
+        features["chroma_mean"] = chroma.mean(axis=1).tolist()
+        features["chroma_std"] = chroma.std(axis=1).tolist()
+
+        # MFCC features
+        mfccs = librosa.feature.mfcc(S=mel_db, n_mfcc=13)
+        features["mfcc_mean"] = mfccs.mean(axis=1).tolist()
+        features["mfcc_std"] = mfccs.std(axis=1).tolist()
+
+        # Zero crossing rate
+        zcr = librosa.feature.zero_crossing_rate(audio_data, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]
+        features["zcr_mean"] = float(np.mean(zcr))
+        features["zcr_std"] = float(np.std(zcr))
+
+        # Spectral rolloff
+        rolloff = librosa.feature.spectral_rolloff(S=magnitude, sr=sr)[0]
+        features["spectral_rolloff_mean"] = float(np.mean(rolloff))
+        features["spectral_rolloff_std"] = float(np.std(rolloff))
+
+        # RMS energy
+        rms = librosa.feature.rms(y=audio_data, frame_length=N_FFT, hop_length=HOP_LENGTH)[0]
+        features["rms_mean"] = float(np.mean(rms))
+        features["rms_std"] = float(np.std(rms))
+
+    except Exception as e:
+        print(f"Error extracting features: {e}")
+
+    return features
+
+
+class ProcessedAudio:
+    """
+    The samples of a processed clip, kept as one NumPy array instead of a
+    list of Python floats (which costs ~30 bytes per sample and more again
+    when serialized). `samples` and `buffer` give zero-copy access;
+    compact() stores the clip as float16 or int16 for a half-size copy,
+    and tobytes() / to_npy() serialize it for another process or storage.
+    """
+
+    DTYPES = ("float32", "float16", "int16")
+
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        if samples.dtype.name not in self.DTYPES:
+            raise ValueError(f"Unsupported sample type {samples.dtype}; use one of {', '.join(self.DTYPES)}")
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def dtype(self) -> str:
+        return self.samples.dtype.name
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes
+
+    @property
+    def buffer(self) -> memoryview:
+        """The raw sample buffer, without copying."""
+        return memoryview(np.ascontiguousarray(self.samples))
+
+    def as_float32(self) -> np.ndarray:
+        """Samples in [-1, 1] as float32; no copy when they already are."""
+        if self.dtype == "int16":
+            return self.samples.astype(np.float32) / 32767
+        return self.samples.astype(np.float32, copy=False)
+
+    def compact(self, dtype: str = "int16") -> "ProcessedAudio":
+        """A copy in a smaller sample type (float16 or int16), half the size of float32."""
+        if dtype == self.dtype:
+            return self
+        if dtype == "int16":
+            pcm = np.empty(self.samples.shape, dtype=np.int16)
+            np.multiply(np.clip(self.as_float32(), -1.0, 1.0), 32767, out=pcm, casting="unsafe")
+            return ProcessedAudio(pcm, self.sample_rate)
+        return ProcessedAudio(self.as_float32().astype(dtype), self.sample_rate)
+
+    def tobytes(self) -> bytes:
+        """The samples as raw native-endian bytes; the reader needs dtype and sample_rate."""
+        return self.samples.tobytes()
+
+    @classmethod
+    def frombuffer(cls, data: bytes, dtype: str, sample_rate: int) -> "ProcessedAudio":
+        """Wraps raw sample bytes from tobytes() without copying (the array is read-only)."""
+        return cls(np.frombuffer(data, dtype=dtype), sample_rate)
+
+    def to_npy(self) -> bytes:
+        """The samples in NumPy's .npy format, which records the dtype and shape."""
+        out = io.BytesIO()
+        np.save(out, self.samples, allow_pickle=False)
+        return out.getvalue()
+
+    @classmethod
+    def from_npy(cls, data: bytes, sample_rate: int) -> "ProcessedAudio":
+        return cls(np.load(io.BytesIO(data), allow_pickle=False), sample_rate)
+
+
 class AudioProcessor:
     def __init__(self):
         self.sample_rate = 22050  # Standard sample rate for audio analysis
@@ -35,7 +181,8 @@ class AudioProcessor:
                 "duration": duration,
                 "sample_rate": sr,
                 "features": features,
-                "audio_data": audio_data.tolist(),  # For AI processing
+                # For AI processing; the array itself, not a list of floats
+                "audio_data": ProcessedAudio(audio_data, sr),
                 "success": True
             }
             
@@ -47,49 +194,8 @@ class AudioProcessor:
     
     async def _extract_audio_features(self, audio_data: np.ndarray, sr: int) -> Dict[str, Any]:
         """Extract audio features for song matching"""
-        features = {}
-        
-        try:
-            # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sr)[0]
-            features["spectral_centroid_mean"] = float(np.mean(spectral_centroids))
-            features["spectral_centroid_std"] = float(np.std(spectral_centroids))
-            
-            # Tempo and beat
-            tempo, beats = librosa.beat.beat_track(y=audio_data, sr=sr)
-            features["tempo"] = float(tempo)
-            features["beat_count"] = len(beats)
-            
-            # Chroma features (pitch classes)
-            chroma = librosa.feature.chroma_stft(y=audio_data, sr=sr)
-            features["chroma_mean"] = chroma.mean(axis=1).tolist()
-            features["chroma_std"] = chroma.std(axis=1).tolist()
-            
-            # MFCC features
-            mfccs = librosa.feature.mfcc(y=audio_data, sr=sr, n_mfcc=13)
-            features["mfcc_mean"] = mfccs.mean(axis=1).tolist()
-            features["mfcc_std"] = mfccs.std(axis=1).tolist()
-            
-            # Zero crossing rate
-            zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
-            features["zcr_mean"] = float(np.mean(zcr))
-            features["zcr_std"] = float(np.std(zcr))
-            
-            # Spectral rolloff
-            rolloff = librosa.feature.spectral_rolloff(y=audio_data, sr=sr)[0]
-            features["spectral_rolloff_mean"] = float(np.mean(rolloff))
-            features["spectral_rolloff_std"] = float(np.std(rolloff))
-            
-            # RMS energy
-            rms = librosa.feature.rms(y=audio_data)[0]
-            features["rms_mean"] = float(np.mean(rms))
-            features["rms_std"] = float(np.std(rms))
-            
-        except Exception as e:
-            print(f"Error extracting features: {e}")
-        
-        return features
-    
+        return await asyncio.to_thread(extract_features, audio_data, sr)
+
     async def apply_remix_effects(
         self, 
         audio_data: np.ndarray, 
@@ -0,0 +1,52 @@
+# In backend/app/services/audio_sample.py
+#
+# Helpers that turn normalized 16-bit PCM into the compact sample sent to
+# ACRCloud: cut to the best voiced identify window, downsampled and wrapped
+# in an in-memory WAV container. NumPy only, so they are cheap to import in
+# transcoder worker processes.
+
+import io
+import wave
+
+import numpy as np
+
+from .voice_activity import select_voiced_window
+
+# What the wave module writes before the frames of a plain PCM file
+WAV_HEADER_BYTES = 44
+
+
+def resample(pcm: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """
+    Linear-interpolation resampler for int16 PCM. When downsampling, a boxcar
+    low-pass runs first to keep aliasing down; good enough for recognition.
+    """
+    if from_rate == to_rate or len(pcm) == 0:
+        return pcm
+
+    signal = pcm.astype(np.float32)
+    if to_rate < from_rate:
+        width = int(np.ceil(from_rate / to_rate))
+        signal = np.convolve(signal, np.full(width, 1.0 / width, dtype=np.float32), mode="same")
+
+    n_out = int(round(len(signal) * to_rate / from_rate))
+    positions = np.arange(n_out, dtype=np.float64) * (from_rate / to_rate)
+    resampled = np.interp(positions, np.arange(len(signal)), signal)
+    return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+
+def encode_wav(pcm: np.ndarray, sample_rate: int) -> bytes:
+    """Wraps mono int16 PCM in a WAV container, in memory."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.ascontiguousarray(pcm, dtype="<i2").tobytes())
+    return buffer.getvalue()
+
+
+def build_identify_sample(pcm: np.ndarray, sample_rate: int, max_seconds: float, target_rate: int) -> bytes:
+    """Cut to the best voiced `max_seconds`, downsample to `target_rate` and encode as WAV."""
+    start, end = select_voiced_window(pcm, sample_rate, max_seconds)
+    return encode_wav(resample(pcm[start:end], sample_rate, target_rate), target_rate)
@@ -0,0 +1,130 @@
+# In backend/app/services/counter_aggregator.py
+
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional
+
+# uid -> stat name -> delta
+Deltas = Dict[str, Dict[str, int]]
+
+
+class CounterAggregator:
+    """
+    Write-behind buffer for user counters. Increments are merged per
+    (uid, stat) in memory and written as one delta per user, either every
+    `interval_seconds` or as soon as `max_pending` users have pending
+    deltas. `write` receives at most `batch_size` users' deltas per call
+    and must apply them atomically (all or nothing), e.g. as one
+    Firestore batch.
+
+    Durability: deltas that were not flushed yet are lost if the process
+    dies; a graceful shutdown flushes them. A failed write puts its deltas
+    (and those of any later chunks) back into the buffer to be retried on
+    the next flush.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Deltas], Awaitable[None]],
+        interval_seconds: float,
+        max_pending: int,
+        batch_size: int,
+    ):
+        self.write = write
+        self.interval_seconds = interval_seconds
+        self.max_pending = max_pending
+        self.batch_size = max(1, batch_size)
+        self._pending: Deltas = defaultdict(lambda: defaultdict(int))
+        # Taken out of _pending by a flush but not written yet
+        self._writing: Deltas = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._early_flush: Optional[asyncio.Task] = None
+        self.events = 0
+        self.flushes = 0
+        self.writes = 0
+        self.failures = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, uid: str, stat_name: str, increment: int = 1):
+        self._pending[uid][stat_name] += increment
+        self.events += 1
+        if self.pending >= self.max_pending and self._task is not None:
+            if self._early_flush is None or self._early_flush.done():
+                self._early_flush = asyncio.create_task(self.flush())
+
+    def unflushed(self, uid: str) -> Dict[str, int]:
+        """Deltas for uid that are not in Firestore yet."""
+        totals = dict(self._writing.get(uid, {}))
+        for stat_name, increment in self._pending.get(uid, {}).items():
+            totals[stat_name] = totals.get(stat_name, 0) + increment
+        return totals
+
+    def _requeue(self, deltas: Deltas):
+        for uid, stats in deltas.items():
+            for stat_name, increment in stats.items():
+                self._pending[uid][stat_name] += increment
+
+    async def flush(self):
+        """Writes everything buffered so far. Safe to call concurrently."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            items = [(uid, dict(stats)) for uid, stats in self._pending.items()]
+            self._pending.clear()
+            self._writing = dict(items)
+            for start in range(0, len(items), self.batch_size):
+                chunk = dict(items[start:start + self.batch_size])
+                try:
+                    await self.write(chunk)
+                except Exception as e:
+                    self.failures += 1
+                    unwritten, self._writing = self._writing, {}
+                    self._requeue(unwritten)
+                    print(f"Error flushing counters for {len(unwritten)} users, will retry: {e}")
+                    return
+                for uid in chunk:
+                    del self._writing[uid]
+                self.writes += len(chunk)
+            self.flushes += 1
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval_seconds)
+            except asyncio.TimeoutError:
+                await self.flush()
+
+    def start(self):
+        """Starts the periodic flush. Called from the app lifespan."""
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the periodic flush and writes out whatever is left. The loop
+        is signalled rather than cancelled, so a flush that is writing
+        right now finishes first; cancelling it could drop (or, if the
+        write still lands, double count) the deltas it had taken.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        if self._early_flush is not None:
+            await self._early_flush
+            self._early_flush = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending_users": self.pending, "events": self.events,
+            "flushes": self.flushes, "writes": self.writes, "failures": self.failures,
+        }
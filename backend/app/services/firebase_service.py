@@ -1,19 +1,98 @@
 # In backend/app/services/firebase_service.py
 
-import firebase_admin
-from firebase_admin import credentials, firestore, auth
 import os
 import json
+import base64
 import asyncio
-from typing import Dict, Any, List, Optional
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 from ..config import settings
+from .counter_aggregator import CounterAggregator, Deltas
+from .firestore_backend import AsyncBackend, DOCUMENT_ID, FirestoreBackend, MemoryBackend, ThreadedBackend
+from .metrics import stage
+from .ttl_cache import TTLCache
+
+# Firestore's limit on writes per batch
+MAX_BATCH_WRITES = 500
+
+# Marks "not in the profile cache"; a cached None means "no such profile".
+_NOT_CACHED = object()
+
+# Profile fields only ever changed by increments. Values passed for them
+# to create_or_update_user are defaults (0) for a new profile, never resets.
+PROFILE_COUNTERS = ("totalHums", "songsIdentified", "totalCommentsMade", "totalLikesReceived")
+
+# What a feed card shows; likedBy and the comments themselves are left out
+FEED_FIELDS = [
+    "userId", "username", "title", "description", "duration", "audioUrl",
+    "processingStatus", "matchedSong", "matchConfidence", "likes",
+    "commentsCount", "createdAt",
+]
+FEED_ORDER = [("createdAt", "desc"), (DOCUMENT_ID, "desc")]
+
+
+def encode_feed_cursor(created_at: Any, hum_id: str) -> str:
+    """An opaque cursor for the page after the hum with this createdAt and ID."""
+    # createdAt is an ISO string for hums created here, a timestamp for
+    # older ones; Firestore orders the two types differently, so keep it
+    if isinstance(created_at, datetime):
+        created_at = {"ts": created_at.isoformat()}
+    raw = json.dumps([created_at, hum_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_feed_cursor(cursor: str) -> List[Any]:
+    """The [createdAt, hum ID] values of a cursor. Raises ValueError if it is malformed."""
+    try:
+        created_at, hum_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(created_at, dict):
+            created_at = datetime.fromisoformat(created_at["ts"])
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid feed cursor: {e}")
+    if not isinstance(hum_id, str):
+        raise ValueError("Invalid feed cursor: bad hum ID")
+    return [created_at, hum_id]
 
 class FirebaseService:
+    """
+    Firestore and Firebase Authentication access. The Admin SDK is slow to
+    import and initialize, so both happen on first use (or in warm_up())
+    rather than when the app is imported. Document reads and writes go
+    through `store`, the backend chosen by settings.firestore_backend.
+    """
+
     def __init__(self):
+        self._db = None
+        self._async_db = None
+        self._store: Optional[FirestoreBackend] = None
+        # Held in threads while the SDK and clients are created, never on the loop
+        self._init_lock = threading.RLock()
+        self._store_lock = threading.Lock()
+        self.profile_cache = TTLCache(
+            settings.profile_cache_max_entries, settings.profile_cache_ttl_seconds
+        )
+        # Public feed pages, keyed on (limit, cursor); cleared when a hum is created
+        self.feed_cache = TTLCache(settings.feed_cache_max_entries, settings.feed_cache_ttl_seconds)
+        self._feed_loads: Dict[Tuple[int, Optional[str]], "asyncio.Task[Dict[str, Any]]"] = {}
+        self._feed_generation = 0
+        self.counters = CounterAggregator(
+            self._write_stat_deltas,
+            settings.counter_flush_interval_seconds,
+            settings.counter_flush_max_pending,
+            batch_size=MAX_BATCH_WRITES,
+        )
+
+    def _initialize_app(self):
         """
         Initializes the Firebase Admin SDK for Firestore and Authentication.
         """
-        if not firebase_admin._apps:
+        import firebase_admin
+        from firebase_admin import credentials
+
+        with self._init_lock:
+            if firebase_admin._apps:
+                return
             # Try to get credentials from environment variable first (for Render)
             google_creds_json = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS_JSON")
             
@@ -38,70 +117,323 @@ class FirebaseService:
             firebase_admin.initialize_app(cred, {
                 'projectId': settings.firebase_project_id,
             })
-        
-        self.db = firestore.client()
 
-    async def verify_token(self, token: str) -> dict:
-        """Verify Firebase ID token and return user info"""
+    @property
+    def db(self):
+        """The blocking Firestore client, created on first use."""
+        if self._db is None:
+            with self._init_lock:
+                if self._db is None:
+                    from firebase_admin import firestore
+
+                    self._initialize_app()
+                    self._db = firestore.client()
+        return self._db
+
+    @property
+    def async_db(self):
+        """The asyncio Firestore client (one gRPC channel), created on first use."""
+        if self._async_db is None:
+            with self._init_lock:
+                if self._async_db is None:
+                    from firebase_admin import firestore_async
+
+                    self._initialize_app()
+                    self._async_db = firestore_async.client()
+        return self._async_db
+
+    @property
+    def store(self) -> FirestoreBackend:
+        """The Firestore backend selected by settings.firestore_backend."""
+        if self._store is None:
+            # Only constructs the backend; its client is created on first call
+            with self._store_lock:
+                if self._store is None:
+                    self._store = self._create_store(settings.firestore_backend)
+        return self._store
+
+    def _create_store(self, backend: str) -> FirestoreBackend:
+        limit = settings.firestore_max_concurrency
+        if backend == "threaded":
+            return ThreadedBackend(lambda: self.db, limit)
+        if backend == "async":
+            return AsyncBackend(lambda: self.async_db, limit)
+        if backend == "memory":
+            print("WARNING: firestore_backend is memory; nothing is saved to Firestore")
+            return MemoryBackend(limit)
+        raise Exception(f"Unknown firestore_backend: {backend}")
+
+    async def warm_up(self):
+        """Does the slow first-use work ahead of time, in threads."""
+        # Requests that arrive meanwhile wait for this same client, off the loop
+        await self.store.connect()
+        await asyncio.to_thread(self._initialize_auth)
+
+    def _initialize_auth(self):
+        from firebase_admin import auth  # noqa: F401
+
+        self._initialize_app()
+
+    def _verify_id_token(self, token: str) -> dict:
+        from firebase_admin import auth
+
+        self._initialize_app()
+        return auth.verify_id_token(token)
+
+    def _cache_profile(self, uid: str, profile: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Stores a profile as it will look in Firestore once written, and returns it."""
+        from firebase_admin import firestore
+
+        if profile is not None:
+            profile = {
+                key: (datetime.utcnow() if value is firestore.SERVER_TIMESTAMP else value)
+                for key, value in profile.items()
+            }
+        self.profile_cache.set(uid, profile)
+        return profile
+
+    def _with_unflushed(self, uid: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds the increments that are buffered but not written yet to a stored profile."""
+        for stat_name, increment in self.counters.unflushed(uid).items():
+            profile[stat_name] = profile.get(stat_name, 0) + increment
+        return profile
+
+    async def decode_token(self, token: str) -> dict:
+        """Verify a Firebase ID token and return all of its claims"""
         try:
             # Run the blocking call in a separate thread
-            decoded_token = await asyncio.to_thread(auth.verify_id_token, token)
-            return {
-                "uid": decoded_token["uid"],
-                "email": decoded_token.get("email"),
-                "name": decoded_token.get("name"),
-                "picture": decoded_token.get("picture"),
-            }
+            return await asyncio.to_thread(self._verify_id_token, token)
         except Exception as e:
             raise Exception(f"Invalid authentication token: {str(e)}")
 
+    @staticmethod
+    def user_info_from_claims(decoded_token: dict) -> dict:
+        return {
+            "uid": decoded_token["uid"],
+            "email": decoded_token.get("email"),
+            "name": decoded_token.get("name"),
+            "picture": decoded_token.get("picture"),
+        }
+
+    async def verify_token(self, token: str) -> dict:
+        """Verify Firebase ID token and return user info"""
+        return self.user_info_from_claims(await self.decode_token(token))
+
     # --- THIS IS THE MISSING FUNCTION THAT IS NOW ADDED BACK ---
     async def get_user_profile(self, uid: str) -> Optional[Dict[str, Any]]:
-        """Gets a user profile document from Firestore by user ID."""
+        """Gets a user profile document, from the profile cache when possible."""
+        cached = self.profile_cache.get(uid, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return dict(cached) if cached is not None else None
+
         try:
-            user_ref = self.db.collection('users').document(uid)
-            doc = await asyncio.to_thread(user_ref.get)
-            if doc.exists:
-                return doc.to_dict()
-            return None
+            with stage("firestore_profile_read"):
+                profile = await self.store.get('users', uid)
+            if profile is not None:
+                profile = self._with_unflushed(uid, profile)
+            self._cache_profile(uid, profile)
+            return dict(profile) if profile is not None else None
         except Exception as e:
             print(f"Error getting user profile for {uid}: {e}")
             return None
     # -----------------------------------------------------------
 
     async def create_or_update_user(self, uid: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Creates or updates a user profile in Firestore."""
+        """
+        Creates or updates a user profile in Firestore, writing through the
+        cache, and returns the profile as it now stands.
+        """
+        from firebase_admin import firestore
+
         try:
-            user_ref = self.db.collection('users').document(uid)
-            doc = await asyncio.to_thread(user_ref.get)
+            # A cached profile saves the existence check. A cached absence
+            # does not: the profile may have been created since, and
+            # creating it again would write its defaults over real values.
+            current = self.profile_cache.get(uid)
+            if current is None:
+                with stage("firestore_profile_read"):
+                    current = await self.store.get('users', uid)
+                if current is not None:
+                    current = self._with_unflushed(uid, current)
 
-            if not doc.exists:
+            if current is None:
                 print(f"User document for {uid} not found. Creating new profile with default stats.")
-                user_data['totalHums'] = 0
-                user_data['songsIdentified'] = 0
-                user_data['totalCommentsMade'] = 0
+                user_data.setdefault('totalHums', 0)
+                user_data.setdefault('songsIdentified', 0)
+                user_data.setdefault('totalCommentsMade', 0)
                 user_data['createdAt'] = firestore.SERVER_TIMESTAMP
-            
-            await asyncio.to_thread(user_ref.set, user_data, merge=True)
-            return user_data
+
+            # Increment(0) creates a missing counter as 0 and leaves an
+            # existing one alone, even if a concurrent request created the
+            # profile and counted a hum after the read above
+            write = {
+                key: firestore.Increment(0) if key in PROFILE_COUNTERS else value
+                for key, value in user_data.items()
+            }
+            with stage("firestore_profile_write"):
+                await self.store.set('users', uid, write, merge=True)
+
+            profile = dict(current or {})
+            profile.update(
+                (key, value) for key, value in user_data.items()
+                if key not in PROFILE_COUNTERS or key not in profile
+            )
+            if current is None:
+                profile = self._with_unflushed(uid, profile)
+            return dict(self._cache_profile(uid, profile))
         except Exception as e:
+            self.profile_cache.pop(uid)
             raise Exception(f"Error in create_or_update_user: {str(e)}")
 
     async def create_hum(self, hum_data: Dict[str, Any]) -> str:
         """Create a new hum document"""
         try:
-            _, hum_ref = await asyncio.to_thread(self.db.collection('hums').add, hum_data)
-            return hum_ref.id
+            with stage("firestore_hum_create"):
+                hum_id = await self.store.add('hums', hum_data)
+            self.invalidate_feed()
+            return hum_id
         except Exception as e:
             raise Exception(f"Error creating hum: {str(e)}")
     
+    def new_hum_id(self) -> str:
+        """Generates a hum document ID locally, without a round-trip."""
+        return self.store.new_id('hums')
+
+    async def create_hum_with_stats(
+        self,
+        hum_data: Dict[str, Any],
+        uid: str,
+        stat_increments: Dict[str, int],
+        hum_id: Optional[str] = None,
+    ) -> str:
+        """
+        Creates a hum document and applies the user's stat increments in one
+        atomic batch commit, i.e. a single round-trip instead of one per write.
+        Pass hum_id (from new_hum_id) to know the ID before committing.
+        With counter aggregation on, only the hum is written here and the
+        increments go through the write-behind buffer instead.
+        """
+        hum_id = hum_id or self.new_hum_id()
+        await self.create_hums_with_stats({hum_id: hum_data}, uid, stat_increments)
+        return hum_id
+
+    async def create_hums_with_stats(
+        self,
+        hums: Dict[str, Dict[str, Any]],
+        uid: str,
+        stat_increments: Dict[str, int],
+    ):
+        """
+        Creates several hum documents (hum ID -> data) of one user, plus the
+        user's combined stat increments, in one atomic batch commit. With
+        counter aggregation on, the increments are buffered instead.
+        """
+        from firebase_admin import firestore
+
+        if len(hums) >= MAX_BATCH_WRITES:
+            raise ValueError(f"At most {MAX_BATCH_WRITES - 1} hums can be committed at once")
+
+        aggregate = settings.counter_aggregation_enabled
+        try:
+            writes = [('hums', hum_id, hum_data, False) for hum_id, hum_data in hums.items()]
+            if stat_increments and not aggregate:
+                writes.append(('users', uid, {
+                    stat_name: firestore.Increment(increment)
+                    for stat_name, increment in stat_increments.items()
+                }, True))
+            with stage("firestore_hum_commit"):
+                await self.store.commit(writes)
+        except Exception as e:
+            self.profile_cache.pop(uid)
+            raise Exception(f"Error creating hum: {str(e)}")
+        self.invalidate_feed()
+
+        for stat_name, increment in stat_increments.items():
+            if aggregate:
+                self.counters.add(uid, stat_name, increment)
+            self._bump_cached_stat(uid, stat_name, increment)
+
+    def invalidate_feed(self):
+        """Drops cached feed pages, and pages still being loaded, after a new hum."""
+        self._feed_generation += 1
+        self.feed_cache.clear()
+        self._feed_loads.clear()
+
+    async def get_public_feed(self, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of public hums, newest first, with only FEED_FIELDS. Pages
+        come from a short-TTL cache, and concurrent misses for the same page
+        share one query. Raises ValueError for a malformed cursor.
+        """
+        start_after = decode_feed_cursor(cursor) if cursor else None
+        key = (limit, cursor)
+        page = self.feed_cache.get(key)
+        if page is not None:
+            return page
+
+        task = self._feed_loads.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load_feed_page(key, start_after))
+            self._feed_loads[key] = task
+            task.add_done_callback(
+                lambda done: self._feed_loads.pop(key) if self._feed_loads.get(key) is done else None
+            )
+        # One caller disconnecting must not cancel the query for the others
+        return await asyncio.shield(task)
+
+    async def _load_feed_page(self, key: Tuple[int, Optional[str]], start_after: Optional[List[Any]]) -> Dict[str, Any]:
+        limit = key[0]
+        generation = self._feed_generation
+        with stage("firestore_feed_query"):
+            docs = await self.store.query(
+                'hums', [('isPublic', '==', True)], FEED_ORDER, limit,
+                start_after=start_after, select=FEED_FIELDS,
+            )
+        hums = [{"id": doc_id, **data} for doc_id, data in docs]
+        next_cursor = None
+        if len(hums) == limit:
+            next_cursor = encode_feed_cursor(hums[-1].get("createdAt"), hums[-1]["id"])
+        page = {"hums": hums, "next_cursor": next_cursor}
+        # A hum created while this query ran may be missing from the page
+        if generation == self._feed_generation:
+            self.feed_cache.set(key, page)
+        return page
+
+    def _bump_cached_stat(self, uid: str, stat_name: str, increment: int):
+        cached = self.profile_cache.get(uid)
+        if cached is not None:
+            cached[stat_name] = cached.get(stat_name, 0) + increment
+
     async def increment_user_stat(self, uid: str, stat_name: str, increment: int = 1):
         """Increment user statistics."""
+        if settings.counter_aggregation_enabled:
+            self.counters.add(uid, stat_name, increment)
+            self._bump_cached_stat(uid, stat_name, increment)
+            return
+
+        from firebase_admin import firestore
+
         try:
-            user_ref = self.db.collection('users').document(uid)
-            await asyncio.to_thread(user_ref.update, {stat_name: firestore.Increment(increment)})
+            with stage("firestore_stat_increment"):
+                await self.store.update('users', uid, {stat_name: firestore.Increment(increment)})
+            self._bump_cached_stat(uid, stat_name, increment)
         except Exception as e:
+            self.profile_cache.pop(uid)
             print(f"Error incrementing user stat {stat_name} for {uid}: {e}")
 
+    async def _write_stat_deltas(self, deltas: Deltas):
+        """Applies merged counter deltas as one batch, one merged set() per user."""
+        from firebase_admin import firestore
+
+        writes = [
+            ('users', uid, {
+                stat_name: firestore.Increment(increment)
+                for stat_name, increment in stats.items()
+            }, True)
+            for uid, stats in deltas.items()
+        ]
+        with stage("firestore_counter_flush"):
+            await self.store.commit(writes)
+
 # Global Firebase service instance
 firebase_service = FirebaseService()
\ No newline at end of file
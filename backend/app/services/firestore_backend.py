@@ -0,0 +1,319 @@
+# In backend/app/services/firestore_backend.py
+
+import asyncio
+import operator
+import random
+import string
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# One write in a batch: (collection, document id, data, merge)
+Write = Tuple[str, str, Dict[str, Any], bool]
+# A where clause: (field, operator, value), e.g. ("isPublic", "==", True)
+Filter = Tuple[str, str, Any]
+# A sort order: (field, "asc" or "desc"); "__name__" is the document ID
+Order = Tuple[str, str]
+
+DOCUMENT_ID = "__name__"
+
+_ID_CHARACTERS = string.ascii_letters + string.digits
+_random = random.SystemRandom()
+
+
+class FirestoreBackend:
+    """
+    The document operations FirebaseService needs, as coroutines. At most
+    `max_concurrency` calls are in flight at once; the rest wait here
+    instead of piling up in a thread pool or on the channel.
+    """
+
+    name = ""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.calls = 0
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        async with self._semaphore:
+            self.in_flight += 1
+            self.calls += 1
+            try:
+                return await self._run(func, *args, **kwargs)
+            finally:
+                self.in_flight -= 1
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError
+
+    def new_id(self, collection: str) -> str:
+        """Generates a document ID locally, without a round-trip."""
+        raise NotImplementedError
+
+    async def connect(self):
+        """Does any slow client setup ahead of the first call."""
+
+    async def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def set(self, collection: str, doc_id: str, data: Dict[str, Any], merge: bool = False):
+        raise NotImplementedError
+
+    async def update(self, collection: str, doc_id: str, data: Dict[str, Any]):
+        """Like set(merge=True), but fails if the document does not exist."""
+        raise NotImplementedError
+
+    async def commit(self, writes: List[Write]):
+        """Applies several set() calls atomically, in one round-trip."""
+        raise NotImplementedError
+
+    async def query(
+        self,
+        collection: str,
+        filters: List[Filter],
+        order_by: List[Order],
+        limit: int,
+        start_after: Optional[List[Any]] = None,
+        select: Optional[List[str]] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Returns (document id, data) pairs matching every filter, sorted by
+        order_by. start_after holds one value per order_by field (a cursor
+        from the previous page's last document); select projects the data
+        to the given fields.
+        """
+        raise NotImplementedError
+
+    async def add(self, collection: str, data: Dict[str, Any]) -> str:
+        doc_id = self.new_id(collection)
+        await self.set(collection, doc_id, data)
+        return doc_id
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name, "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight, "calls": self.calls,
+        }
+
+
+class ThreadedBackend(FirestoreBackend):
+    """
+    The blocking google-cloud-firestore client, each call run in the
+    default thread pool. `client` returns the client, creating it on first
+    use; that can block for a while, so it is only ever called in a thread.
+    Each operation is a function of the client, run once it exists.
+    """
+
+    name = "threaded"
+
+    def __init__(self, client: Callable[[], Any], max_concurrency: int):
+        super().__init__(max_concurrency)
+        self._client = client
+        self._connecting: Optional["asyncio.Future[Any]"] = None
+
+    async def connect(self):
+        await self._connected()
+
+    async def _connected(self) -> Any:
+        """The client. Callers wait here, not on the loop, while it is created (or warmed up)."""
+        if self._connecting is None:
+            self._connecting = asyncio.ensure_future(asyncio.to_thread(self._client))
+        try:
+            return await asyncio.shield(self._connecting)
+        except Exception:
+            # Let the next call try again
+            self._connecting = None
+            raise
+
+    async def _call(self, func, *args, **kwargs):
+        client = await self._connected()
+        return await super()._call(func, client, *args, **kwargs)
+
+    async def _run(self, func, *args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    def new_id(self, collection: str) -> str:
+        # The same 20-character IDs the client generates, without needing one
+        return "".join(_random.choice(_ID_CHARACTERS) for _ in range(20))
+
+    async def get(self, collection, doc_id):
+        doc = await self._call(lambda db: db.collection(collection).document(doc_id).get())
+        return doc.to_dict() if doc.exists else None
+
+    async def set(self, collection, doc_id, data, merge=False):
+        await self._call(lambda db: db.collection(collection).document(doc_id).set(data, merge=merge))
+
+    async def update(self, collection, doc_id, data):
+        await self._call(lambda db: db.collection(collection).document(doc_id).update(data))
+
+    async def commit(self, writes):
+        def commit(db):
+            batch = db.batch()
+            for collection, doc_id, data, merge in writes:
+                batch.set(db.collection(collection).document(doc_id), data, merge=merge)
+            return batch.commit()
+
+        await self._call(commit)
+
+    async def query(self, collection, filters, order_by, limit, start_after=None, select=None):
+        def run_query(db):
+            from google.cloud.firestore import FieldFilter, Query
+
+            query = db.collection(collection)
+            for field, op, value in filters:
+                query = query.where(filter=FieldFilter(field, op, value))
+            for field, direction in order_by:
+                query = query.order_by(field, direction=Query.DESCENDING if direction == "desc" else Query.ASCENDING)
+            if select:
+                query = query.select(select)
+            if start_after is not None:
+                query = query.start_after(dict(zip((field for field, _ in order_by), start_after)))
+            return query.limit(limit).get()
+
+        docs = await self._call(run_query)
+        return [(doc.id, doc.to_dict()) for doc in docs]
+
+
+class AsyncBackend(ThreadedBackend):
+    """
+    Firestore's native asyncio client. Calls run on the event loop over one
+    shared gRPC channel, so no thread is tied up per in-flight call; only
+    creating the client happens in a thread.
+    """
+
+    name = "async"
+
+    async def _run(self, func, *args, **kwargs):
+        return await func(*args, **kwargs)
+
+
+_OPERATORS = {
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt,
+    "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Orders mixed types the way Firestore does (null < bool < number < timestamp < string)."""
+    if value is None:
+        return 0, 0
+    if isinstance(value, bool):
+        return 1, value
+    if isinstance(value, (int, float)):
+        return 2, value
+    if isinstance(value, datetime):
+        return 3, value.replace(tzinfo=None)
+    if isinstance(value, str):
+        return 4, value
+    return 5, repr(value)
+
+
+class _Descending:
+    """Inverts the comparison of a sort key, for descending orders."""
+
+    def __init__(self, key: Tuple[int, Any]):
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.key == other.key
+
+
+class MemoryBackend(FirestoreBackend):
+    """
+    Keeps every document in process, for local development, tests and
+    benchmarks. Each call awaits `latency` seconds to model a round-trip.
+    Understands the Increment and SERVER_TIMESTAMP sentinels.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_concurrency: int, latency: float = 0.0):
+        super().__init__(max_concurrency)
+        self.latency = latency
+        self.data: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.reads = 0
+        self.writes = 0
+
+    async def _run(self, func, *args, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return func(*args, **kwargs)
+
+    def new_id(self, collection: str) -> str:
+        return uuid.uuid4().hex[:20]
+
+    def _read(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        self.reads += 1
+        doc = self.data[collection].get(doc_id)
+        return dict(doc) if doc is not None else None
+
+    def _write(self, collection: str, doc_id: str, data: Dict[str, Any], merge: bool):
+        from firebase_admin import firestore
+
+        self.writes += 1
+        current = dict(self.data[collection].get(doc_id, {})) if merge else {}
+        for key, value in data.items():
+            if isinstance(value, firestore.Increment):
+                current[key] = current.get(key, 0) + value.value
+            elif value is firestore.SERVER_TIMESTAMP:
+                current[key] = datetime.utcnow()
+            else:
+                current[key] = value
+        self.data[collection][doc_id] = current
+
+    def _update(self, collection: str, doc_id: str, data: Dict[str, Any]):
+        if doc_id not in self.data[collection]:
+            raise KeyError(f"No document to update: {collection}/{doc_id}")
+        self._write(collection, doc_id, data, merge=True)
+
+    def _commit(self, writes: List[Write]):
+        for write in writes:
+            self._write(*write)
+
+    def _query(self, collection, filters, order_by, limit, start_after, select):
+        def key(doc_id: str, data: Dict[str, Any]) -> list:
+            values = [doc_id if field == DOCUMENT_ID else data.get(field) for field, _ in order_by]
+            return [
+                _Descending(_sort_key(value)) if direction == "desc" else _sort_key(value)
+                for value, (_, direction) in zip(values, order_by)
+            ]
+
+        matches = [
+            (doc_id, data) for doc_id, data in self.data[collection].items()
+            if all(field in data and _OPERATORS[op](data[field], value) for field, op, value in filters)
+        ]
+        matches.sort(key=lambda item: key(*item))
+        if start_after is not None:
+            values = dict(zip((field for field, _ in order_by), start_after))
+            cursor = key(values.get(DOCUMENT_ID), values)
+            matches = [item for item in matches if cursor < key(*item)]
+
+        self.reads += max(1, min(limit, len(matches)))
+        return [
+            (doc_id, {field: data[field] for field in select if field in data} if select else dict(data))
+            for doc_id, data in matches[:limit]
+        ]
+
+    async def get(self, collection, doc_id):
+        return await self._call(self._read, collection, doc_id)
+
+    async def set(self, collection, doc_id, data, merge=False):
+        await self._call(self._write, collection, doc_id, data, merge)
+
+    async def update(self, collection, doc_id, data):
+        await self._call(self._update, collection, doc_id, data)
+
+    async def commit(self, writes):
+        await self._call(self._commit, list(writes))
+
+    async def query(self, collection, filters, order_by, limit, start_after=None, select=None):
+        return await self._call(self._query, collection, filters, order_by, limit, start_after, select)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "reads": self.reads, "writes": self.writes}
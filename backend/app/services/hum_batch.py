@@ -0,0 +1,135 @@
+# In backend/app/services/hum_batch.py
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List
+
+from ..config import settings
+from .firebase_service import firebase_service, MAX_BATCH_WRITES
+from .hum_pipeline import hum_pipeline, identify_result
+from .metrics import IDENTIFY_RESULTS
+from .song_matcher import song_matcher
+from .transcoder import transcoder, TranscoderBusy
+from .upload_ingest import SpooledUpload
+
+# How often one item retries when the transcoder pool is full of other work
+BUSY_RETRIES = 10
+
+
+class HumBatch:
+    """
+    Identifies many spooled uploads of one user. Transcodes and ACRCloud
+    calls each run under their own concurrency limit, results are reported
+    as soon as each item finishes, and the new hums are committed in
+    batched writes of up to settings.batch_commit_size.
+
+    run() yields one event per line of the NDJSON response:
+
+    - {"type": "item", ...} per upload, in completion order
+    - {"type": "commit", ...} per batched write, with the hum IDs it saved
+    - {"type": "summary", ...} last
+    """
+
+    async def _transcode(self, path: str) -> Dict[str, Any]:
+        for attempt in range(BUSY_RETRIES):
+            try:
+                return await transcoder.prepare_identify_sample(path)
+            except TranscoderBusy as e:
+                if attempt == BUSY_RETRIES - 1:
+                    raise
+                await asyncio.sleep(min(e.retry_after, 1.0))
+
+    async def _identify_item(
+        self,
+        index: int,
+        upload: SpooledUpload,
+        transcode_slots: asyncio.Semaphore,
+        identify_slots: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        item: Dict[str, Any] = {"type": "item", "index": index, "filename": upload.filename}
+        try:
+            async with transcode_slots:
+                prepared = await self._transcode(upload.path)
+            async with identify_slots:
+                identified = await song_matcher.identify_hum(prepared["sample"], prepared["audio_hash"])
+            IDENTIFY_RESULTS.inc(result=identify_result(identified))
+            item.update(
+                matches=identified["matches"], match_error=identified["error"],
+                preprocessing=prepared["preprocessing"], wav_size=prepared["wav_size"],
+            )
+        except Exception as e:
+            print(f"ERROR identifying batch item {upload.filename}: {e}")
+            item.update(processing_status="failed", error=str(e))
+        finally:
+            upload.cleanup()
+        return item
+
+    async def _commit(self, hums: Dict[str, Dict[str, Any]], uid: str, profile_task: "asyncio.Task[bool]") -> Dict[str, Any]:
+        # As in HumPipeline.persist, the profile must exist before the increments
+        await profile_task
+        stat_increments = {"totalHums": len(hums)}
+        identified = sum(1 for hum_data in hums.values() if hum_data["matchedSong"])
+        if identified:
+            stat_increments["songsIdentified"] = identified
+
+        try:
+            await firebase_service.create_hums_with_stats(hums, uid, stat_increments)
+            return {"type": "commit", "hum_ids": list(hums), "saved": True}
+        except Exception as e:
+            print(f"ERROR committing {len(hums)} batch hums for {uid}: {e}")
+            return {"type": "commit", "hum_ids": list(hums), "saved": False, "error": str(e)}
+
+    async def run(self, uploads: List[SpooledUpload], user: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Processes every upload, deleting each spooled file once it is done."""
+        transcode_slots = asyncio.Semaphore(settings.batch_transcode_concurrency or transcoder.max_workers)
+        identify_slots = asyncio.Semaphore(settings.batch_identify_concurrency)
+        commit_size = max(1, min(settings.batch_commit_size, MAX_BATCH_WRITES - 1))
+
+        profile_task = asyncio.create_task(hum_pipeline.ensure_profile(user))
+        tasks = [
+            asyncio.create_task(self._identify_item(index, upload, transcode_slots, identify_slots))
+            for index, upload in enumerate(uploads)
+        ]
+        summary = {"type": "summary", "items": len(uploads), "completed": 0, "no_match": 0, "failed": 0, "saved": 0}
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        async def commit_pending() -> Dict[str, Any]:
+            result = await self._commit(dict(pending), user["uid"], profile_task)
+            if result["saved"]:
+                summary["saved"] += len(pending)
+            pending.clear()
+            return result
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                if "error" not in item:
+                    upload = uploads[item["index"]]
+                    title = os.path.splitext(upload.filename or "")[0] or f"Hum {item['index'] + 1}"
+                    # Stored as fileSize, not sent to the client
+                    wav_size = item.pop("wav_size")
+                    hum_data = hum_pipeline.build_hum_data(
+                        user, title, wav_size, item["matches"], item["match_error"]
+                    )
+                    hum_id = firebase_service.new_hum_id()
+                    pending[hum_id] = hum_data
+                    item.update(hum_id=hum_id, title=title, processing_status=hum_data["processingStatus"])
+                summary[item["processing_status"]] += 1
+                yield item
+
+                if len(pending) >= commit_size:
+                    yield await commit_pending()
+
+            if pending:
+                yield await commit_pending()
+            yield summary
+        finally:
+            # Also reached when the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
+            profile_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            for upload in uploads:
+                upload.cleanup()
+
+
+hum_batch = HumBatch()
@@ -0,0 +1,140 @@
+# In backend/app/services/hum_pipeline.py
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+from .firebase_service import firebase_service
+from .metrics import IDENTIFY_RESULTS
+from .song_matcher import song_matcher
+from .transcoder import transcoder
+
+
+def identify_result(identified: Dict[str, Any]) -> str:
+    """The IDENTIFY_RESULTS label for a song_matcher.identify_hum answer."""
+    if identified["error"]:
+        return "error"
+    return "match" if identified["matches"] else "no_match"
+
+
+class HumPipeline:
+    """
+    The upload -> transcode -> identify -> persist steps behind
+    /upload-and-match, arranged so independent I/O overlaps:
+
+    - the user's profile is looked up (and created if missing) while the
+      upload is being transcoded and identified;
+    - the hum document and stat increments are committed after the
+      matches are known, optionally in the background so the client gets
+      its matches as soon as ACRCloud answers.
+    """
+
+    async def ensure_profile(self, user: Dict[str, Any]) -> bool:
+        """Creates a minimal profile for first-time users. Never raises."""
+        try:
+            user_profile = await firebase_service.get_user_profile(user["uid"])
+            if not user_profile:
+                await firebase_service.create_or_update_user(user["uid"], {
+                    "email": user.get("email"), "name": user.get("name")
+                })
+            return True
+        except Exception as e:
+            print(f"Error ensuring profile for {user['uid']}: {e}")
+            return False
+
+    async def identify(self, upload_path: str) -> Dict[str, Any]:
+        """Transcodes in the worker pool, then identifies the compact sample."""
+        prepared = await transcoder.prepare_identify_sample(upload_path)
+        identified = await song_matcher.identify_hum(prepared["sample"], prepared["audio_hash"])
+        IDENTIFY_RESULTS.inc(result=identify_result(identified))
+        return {"prepared": prepared, **identified}
+
+    def build_hum_data(
+        self,
+        user: Dict[str, Any],
+        title: str,
+        file_size: int,
+        matches: List[Dict[str, Any]],
+        match_error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """The hum document. A hum whose matching failed is "failed", not "no_match"."""
+        best_match = matches[0] if matches else None
+        if match_error:
+            status = "failed"
+        else:
+            status = "completed" if best_match else "no_match"
+        return {
+            "userId": user["uid"], "username": user.get("name", "Anonymous"),
+            "title": title, "audioUrl": "", "fileSize": file_size,
+            "audioFormat": "wav", "processingStatus": status,
+            "isPublic": True, "likes": 0, "likedBy": [], "commentsCount": 0,
+            "matchedSong": best_match, "matchConfidence": best_match['confidence'] if best_match else 0,
+            "createdAt": datetime.utcnow().isoformat()
+        }
+
+    async def persist(
+        self,
+        hum_id: str,
+        hum_data: Dict[str, Any],
+        uid: str,
+        profile_task: "asyncio.Task[bool]",
+    ):
+        """Commits the hum and stat increments once the profile exists."""
+        # The profile must exist first: creating it sets the counters to 0,
+        # which would otherwise race with the increments below.
+        await profile_task
+
+        stat_increments = {"totalHums": 1}
+        if hum_data["matchedSong"]:
+            stat_increments["songsIdentified"] = 1
+        await firebase_service.create_hum_with_stats(hum_data, uid, stat_increments, hum_id=hum_id)
+
+    async def _persist_logged(self, *args: Any):
+        try:
+            await self.persist(*args)
+        except Exception as e:
+            print(f"ERROR persisting hum {args[0]} in the background: {e}")
+
+    async def run(
+        self,
+        upload_path: str,
+        title: str,
+        user: Dict[str, Any],
+        schedule_background: Optional[Callable[..., Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Runs the whole pipeline for one upload. When schedule_background
+        (e.g. BackgroundTasks.add_task) is given and background persistence
+        is enabled, the Firestore commit happens after the response is sent;
+        the hum ID is generated locally so it can still be returned.
+        """
+        profile_task = asyncio.create_task(self.ensure_profile(user))
+        try:
+            identified = await self.identify(upload_path)
+        except BaseException:
+            # Let the profile write finish on its own; it is harmless
+            profile_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            raise
+
+        matches = identified["matches"]
+        hum_data = self.build_hum_data(
+            user, title, identified["prepared"]["wav_size"], matches, identified["error"]
+        )
+        hum_id = firebase_service.new_hum_id()
+
+        if schedule_background is not None and settings.persist_hums_in_background:
+            schedule_background(self._persist_logged, hum_id, hum_data, user["uid"], profile_task)
+        else:
+            await self.persist(hum_id, hum_data, user["uid"], profile_task)
+
+        return {
+            "hum_id": hum_id, "title": title, "matches": matches,
+            "processing_status": hum_data["processingStatus"],
+            "match_error": identified["error"],
+            # How much audio was cut before identification
+            "preprocessing": identified["prepared"]["preprocessing"],
+        }
+
+
+hum_pipeline = HumPipeline()
@@ -0,0 +1,206 @@
+# In backend/app/services/job_queue.py
+
+import asyncio
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from ..config import settings
+from .ttl_cache import TTLCache
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+FINISHED_STATES = (COMPLETED, FAILED)
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue has no room for another job."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many identification jobs are queued, please retry shortly")
+        self.retry_after = retry_after
+
+
+class Job:
+    """One unit of background work and its latest state."""
+
+    def __init__(
+        self,
+        owner: str,
+        func: Callable[..., Awaitable[Any]],
+        args: tuple,
+        cleanup: Optional[Callable[[], None]] = None,
+    ):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.func = func
+        self.args = args
+        self.cleanup = cleanup
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        # Replaced on every update; watchers wait on the one they saw last
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def update(self, status: str, result: Any = None, error: Optional[str] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.updated_at = time.time()
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id, "status": self.status,
+            "result": self.result, "error": self.error,
+            "created_at": self.created_at, "updated_at": self.updated_at,
+        }
+
+
+class JobQueue:
+    """
+    An in-process queue of coroutine jobs drained by a fixed number of
+    worker tasks. Requests only enqueue and return, so slow ACRCloud calls
+    hold a worker slot here instead of an HTTP connection. Jobs (and their
+    results) are kept for a TTL and are only visible to their owner.
+    State is per process; it is lost on restart.
+    """
+
+    def __init__(self):
+        self.worker_count = settings.job_workers
+        self.retry_after_seconds = settings.job_retry_after_seconds
+        self.shutdown_timeout_seconds = settings.job_shutdown_timeout_seconds
+        self.jobs = TTLCache(settings.job_max_entries, settings.job_ttl_seconds)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=settings.job_max_queue)
+        return self._queue
+
+    def start(self):
+        """Starts the worker tasks. Called from the app lifespan."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker()) for _ in range(max(1, self.worker_count))
+            ]
+
+    async def stop(self):
+        """
+        Lets the workers drain the queue for up to shutdown_timeout_seconds,
+        then cancels them. Jobs cancelled mid-run and jobs that never ran
+        are marked failed, so pollers and event streams see a final state.
+        """
+        if self._workers and self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), self.shutdown_timeout_seconds)
+            except asyncio.TimeoutError:
+                print(f"WARNING: jobs still pending after {self.shutdown_timeout_seconds}s, cancelling them")
+
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+        # Release whatever the jobs that never ran were holding on to
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._finish(job, FAILED, error="Server shutting down")
+        # A new queue for the next start, which may be on another event loop
+        self._queue = None
+
+    def submit(
+        self,
+        owner: str,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> Job:
+        """Enqueues func(*args). Raises JobQueueFull instead of waiting."""
+        job = Job(owner, func, args, cleanup)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFull(self.retry_after_seconds)
+        self.jobs.set(job.id, job)
+        return job
+
+    def get(self, job_id: str, owner: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is None or job.owner != owner:
+            return None
+        return job
+
+    async def watch(self, job: Job, keepalive_seconds: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yields a snapshot now and after every change until the job finishes.
+        Yields None when nothing changed for keepalive_seconds.
+        """
+        while True:
+            changed = job._changed
+            yield job.snapshot()
+            if job.finished:
+                return
+            while not changed.is_set():
+                try:
+                    await asyncio.wait_for(changed.wait(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None):
+        job.update(status, result=result, error=error)
+        # Drop the references so finished jobs only keep their result
+        job.func, job.args = None, ()
+        if job.cleanup is not None:
+            try:
+                job.cleanup()
+            except Exception as e:
+                print(f"Error cleaning up job {job.id}: {e}")
+            job.cleanup = None
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                job.update(RUNNING)
+                result = await job.func(*job.args)
+                self._finish(job, COMPLETED, result=result)
+                self.completed += 1
+            except asyncio.CancelledError:
+                self._finish(job, FAILED, error="Server shutting down")
+                raise
+            except Exception as e:
+                print(f"ERROR in job {job.id}: {e}")
+                self._finish(job, FAILED, error=str(e))
+                self.failed += 1
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._workers), "queued": self.queue.qsize(),
+            "tracked": len(self.jobs), "completed": self.completed,
+            "failed": self.failed, "rejected": self.rejected,
+        }
+
+
+job_queue = JobQueue()
@@ -0,0 +1,105 @@
+# In backend/app/services/match_cache.py
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+from .ttl_cache import TTLCache
+
+
+class MatchCache:
+    """
+    Caches identification results by a hash of the normalized audio.
+    An in-memory LRU sits in front of an optional SQLite file so results
+    survive restarts and are shared by workers on the same host.
+    """
+
+    def __init__(self, sqlite_path: Optional[str] = None):
+        self.memory = TTLCache(settings.match_cache_max_entries, settings.match_cache_ttl_seconds)
+        self.ttl_seconds = settings.match_cache_ttl_seconds
+        self.sqlite_path = sqlite_path or settings.match_cache_sqlite_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.sqlite_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS match_cache ("
+                "key TEXT PRIMARY KEY, matches TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT matches FROM match_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _disk_set(self, key: str, payload: str):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO match_cache (key, matches, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + self.ttl_seconds),
+            )
+            conn.execute("DELETE FROM match_cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+
+    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        matches = self.memory.get(key)
+        if matches is not None or not self.sqlite_path:
+            return matches
+
+        try:
+            payload = await asyncio.to_thread(self._disk_get, key)
+        except sqlite3.Error as e:
+            print(f"Error reading match cache: {e}")
+            return None
+        if payload is None:
+            return None
+
+        self.disk_hits += 1
+        matches = json.loads(payload)
+        self.memory.set(key, matches)
+        return matches
+
+    async def set(self, key: str, matches: List[Dict[str, Any]]):
+        self.memory.set(key, matches)
+        if not self.sqlite_path:
+            return
+        try:
+            await asyncio.to_thread(self._disk_set, key, json.dumps(matches))
+        except sqlite3.Error as e:
+            print(f"Error writing match cache: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        memory = self.memory.stats()
+        return {
+            "hits": memory["hits"] + self.disk_hits,
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": memory["misses"] - self.disk_hits,
+            "size": memory["size"],
+            "evictions": memory["evictions"],
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+match_cache = MatchCache()
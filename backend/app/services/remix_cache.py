@@ -0,0 +1,79 @@
+# In backend/app/services/remix_cache.py
+
+import os
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .ttl_cache import TTLCache
+
+
+def _remove_render(key: Hashable, entry: Dict[str, Any]):
+    try:
+        os.remove(entry["path"])
+    except FileNotFoundError:
+        pass
+
+
+class RemixCache:
+    """
+    Two caches for /remix:
+    - renders: (upload hash, effect settings) -> an already encoded output
+      file in static/uploads. Evicted files are deleted from disk.
+    - sources: upload hash -> decoded float32 samples, so a slider change on
+      the same recording skips the decode step.
+    """
+
+    def __init__(self):
+        self.renders = TTLCache(
+            settings.remix_cache_max_entries,
+            settings.remix_cache_ttl_seconds,
+            max_bytes=settings.remix_cache_max_mb * 1024 * 1024,
+            on_evict=_remove_render,
+        )
+        self.sources = TTLCache(
+            settings.remix_cache_max_entries,
+            settings.remix_source_cache_ttl_seconds,
+            max_bytes=settings.remix_source_cache_mb * 1024 * 1024,
+        )
+
+    @staticmethod
+    def render_key(audio_hash: str, params: Dict[str, Any]) -> Tuple:
+        return (
+            audio_hash, params["pitch"], float(params["speed"]), bool(params["reverse"]),
+            params["echo"], params["reverb"], bool(params.get("preview")),
+        )
+
+    def get_render(self, key: Tuple) -> Optional[str]:
+        """Returns the cached output filename, if the file is still on disk."""
+        entry = self.renders.get(key)
+        if entry is None:
+            return None
+        if not os.path.exists(entry["path"]):
+            self.renders.pop(key)
+            return None
+        return entry["filename"]
+
+    def put_render(self, key: Tuple, filename: str, path: str):
+        size = os.path.getsize(path)
+        self.renders.set(key, {"filename": filename, "path": path}, size=size)
+
+    @property
+    def max_source_bytes(self) -> int:
+        """The largest decoded source the cache will keep."""
+        if self.sources.max_size <= 0 or self.sources.ttl_seconds <= 0:
+            return 0
+        return self.sources.max_bytes
+
+    def get_source(self, audio_hash: str) -> Optional[Tuple[np.ndarray, int]]:
+        return self.sources.get(audio_hash)
+
+    def put_source(self, audio_hash: str, samples: np.ndarray, sample_rate: int):
+        self.sources.set(audio_hash, (samples, sample_rate), size=samples.nbytes)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"renders": self.renders.stats(), "sources": self.sources.stats()}
+
+
+remix_cache = RemixCache()
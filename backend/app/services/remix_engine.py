@@ -0,0 +1,214 @@
+# In backend/app/services/remix_engine.py
+#
+# The /remix effect chain as one float32 NumPy pipeline: decode once, apply
+# every effect on a single (frames, channels) buffer, encode once. These are
+# plain module-level functions so they can run in the transcoder's worker
+# processes.
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+
+ECHO_DELAY_SECONDS = 0.15
+REVERB_SECONDS = 1.2
+# Fixed seed so the same reverb setting always renders the same output
+REVERB_SEED = 1234
+# Accepted effect ranges. Together they slow audio down at most 8x
+MAX_PITCH_SEMITONES = 12
+MIN_SPEED = 0.25
+MAX_SPEED = 4.0
+# Longer renders are cut off, whatever the input and settings
+MAX_OUTPUT_SECONDS = 600
+
+
+def decode_audio(input_path: str) -> Tuple[np.ndarray, int]:
+    """Decodes a file into float32 samples shaped (frames, channels) in [-1, 1]."""
+    sound = AudioSegment.from_file(input_path)
+    if sound.sample_width not in (1, 2, 4):
+        sound = sound.set_sample_width(2)
+
+    dtype = {1: np.int8, 2: np.int16, 4: np.int32}[sound.sample_width]
+    samples = np.frombuffer(sound.raw_data, dtype=dtype).reshape(-1, sound.channels)
+    audio = samples.astype(np.float32)
+    audio *= np.float32(1.0 / (2 ** (8 * sound.sample_width - 1)))
+    return audio, sound.frame_rate
+
+
+def encode_audio(samples: np.ndarray, sample_rate: int, output_path: str, audio_format: str = "mp3"):
+    """Converts float32 samples back to 16-bit PCM and encodes them once."""
+    pcm = np.empty(samples.shape, dtype=np.int16)
+    np.multiply(np.clip(samples, -1.0, 1.0), 32767, out=pcm, casting="unsafe")
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    AudioSegment(
+        data=pcm.tobytes(),
+        sample_width=2,
+        frame_rate=sample_rate,
+        channels=samples.shape[1],
+    ).export(output_path, format=audio_format)
+
+
+def _change_rate(samples: np.ndarray, rate: float, max_frames: int) -> np.ndarray:
+    """
+    Plays the audio `rate` times faster (higher pitch, shorter) by linear
+    interpolation, writing every channel into one preallocated buffer of
+    at most `max_frames`.
+    """
+    n_in = len(samples)
+    n_out = min(max(1, int(n_in / rate)), max_frames)
+    positions = np.arange(n_out, dtype=np.float64) * rate
+    source = np.arange(n_in, dtype=np.float64)
+
+    out = np.empty((n_out, samples.shape[1]), dtype=np.float32)
+    for channel in range(samples.shape[1]):
+        out[:, channel] = np.interp(positions, source, samples[:, channel])
+    return out
+
+
+def _reverb_impulse(sample_rate: int, intensity: float) -> np.ndarray:
+    """An exponentially decaying noise tail, longer for higher intensity."""
+    length = max(1, int(REVERB_SECONDS * sample_rate * (0.3 + 0.7 * intensity)))
+    rng = np.random.default_rng(REVERB_SEED)
+    decay = np.exp(-6.0 * np.arange(length, dtype=np.float32) / length)
+    impulse = rng.standard_normal(length).astype(np.float32) * decay
+    return impulse / np.sqrt(np.sum(impulse * impulse))
+
+
+def _add_reverb(samples: np.ndarray, sample_rate: int, intensity: float):
+    """
+    Mixes in the signal convolved with the reverb impulse, in place. The
+    convolution is FFT overlap-add: blocks about as long as the impulse keep
+    the transforms small instead of one huge FFT over the whole recording.
+    """
+    impulse = _reverb_impulse(sample_rate, intensity)
+    n_fft = 1 << (2 * len(impulse) - 1).bit_length()
+    block = n_fft - len(impulse) + 1
+    impulse_spectrum = np.fft.rfft(impulse, n=n_fft)[:, None]
+
+    n = len(samples)
+    wet = np.zeros((n + n_fft, samples.shape[1]), dtype=np.float32)
+    for start in range(0, n, block):
+        spectrum = np.fft.rfft(samples[start:start + block], n=n_fft, axis=0)
+        spectrum *= impulse_spectrum
+        wet[start:start + n_fft] += np.fft.irfft(spectrum, n=n_fft, axis=0)
+
+    wet_gain = 0.5 * intensity
+    samples *= np.float32(1.0 - wet_gain)
+    wet_tail = wet[:n]
+    wet_tail *= np.float32(wet_gain)
+    samples += wet_tail
+
+
+def apply_effects(
+    samples: np.ndarray,
+    sample_rate: int,
+    params: Dict[str, Any],
+    output_rate: Optional[int] = None,
+    max_seconds: float = MAX_OUTPUT_SECONDS,
+) -> np.ndarray:
+    """
+    Applies pitch, speed, reverse, echo and reverb to a (frames, channels)
+    float32 buffer. Reverse, pitch, speed and any conversion to
+    `output_rate` are combined into a single resampling pass, which also
+    stops after `max_seconds` of output; every later effect works on that
+    one buffer in place. The result is at `output_rate` (default: the
+    input rate).
+    """
+    pitch = params.get("pitch", 0)
+    speed = params.get("speed", 1.0)
+    if abs(pitch) > MAX_PITCH_SEMITONES:
+        raise ValueError(f"Pitch must be between -{MAX_PITCH_SEMITONES} and {MAX_PITCH_SEMITONES} semitones.")
+    if not MIN_SPEED <= speed <= MAX_SPEED:
+        raise ValueError(f"Speed must be between {MIN_SPEED} and {MAX_SPEED}.")
+
+    output_rate = output_rate or sample_rate
+    rate = (2.0 ** (pitch / 12.0)) * speed * (sample_rate / output_rate)
+    sample_rate = output_rate
+    max_frames = max(1, int(max_seconds * output_rate))
+    if params.get("reverse"):
+        # A reversed view; the resampling pass below writes a fresh buffer
+        samples = samples[::-1]
+    if rate != 1.0:
+        samples = _change_rate(samples, rate, max_frames)
+    else:
+        samples = samples[:max_frames].copy()
+
+    echo = params.get("echo", 0)
+    if echo > 0:
+        delay = int(ECHO_DELAY_SECONDS * sample_rate)
+        if len(samples) > delay:
+            gain = np.float32(0.7 * echo / 100)
+            # Walk backwards so each block still reads the dry signal
+            for end in range(len(samples), delay, -delay):
+                start = max(delay, end - delay)
+                samples[start:end] += samples[start - delay:end - delay] * gain
+
+    reverb = params.get("reverb", 0)
+    if reverb > 0:
+        _add_reverb(samples, sample_rate, min(reverb, 100) / 100)
+
+    peak = np.abs(samples).max() if len(samples) else 0.0
+    if peak > 1.0:
+        samples /= peak
+    return samples
+
+
+def _preview_slice(samples: np.ndarray, sample_rate: int, params: Dict[str, Any], seconds: float) -> np.ndarray:
+    """The part of the input that ends up in the first `seconds` of output."""
+    playback_rate = (2.0 ** (params.get("pitch", 0) / 12.0)) * params.get("speed", 1.0)
+    frames = int(seconds * sample_rate * playback_rate)
+    # Reversed output starts with the end of the recording
+    return samples[-frames:] if params.get("reverse") else samples[:frames]
+
+
+def render_decoded(
+    samples: np.ndarray,
+    sample_rate: int,
+    output_path: str,
+    params: Dict[str, Any],
+    audio_format: str = "mp3",
+    preview_seconds: Optional[float] = None,
+    output_rate: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Applies effects to already decoded samples and encodes the result.
+    With preview_seconds only that much output is rendered.
+    """
+    if preview_seconds:
+        samples = _preview_slice(samples, sample_rate, params, preview_seconds)
+    # Never upsample: a preview of an 8 kHz recording stays at 8 kHz
+    output_rate = min(output_rate, sample_rate) if output_rate else sample_rate
+
+    rendered = apply_effects(samples, sample_rate, params, output_rate)
+    encode_audio(rendered, output_rate, output_path, audio_format)
+    return {
+        "path": output_path,
+        "duration": len(rendered) / output_rate,
+        "file_size": os.path.getsize(output_path),
+    }
+
+
+def render_remix(
+    input_path: str,
+    output_path: str,
+    params: Dict[str, Any],
+    audio_format: str = "mp3",
+    max_source_bytes: int = 0,
+    preview_seconds: Optional[float] = None,
+    output_rate: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Decode, apply effects and encode in one go. Runs in a worker process.
+    The decoded samples come back too, for caching, if they take at most
+    max_source_bytes: larger ones would be pickled back to the parent
+    only for the cache to reject them.
+    """
+    samples, sample_rate = decode_audio(input_path)
+    result = render_decoded(
+        samples, sample_rate, output_path, params, audio_format, preview_seconds, output_rate
+    )
+    if samples.nbytes <= max_source_bytes:
+        result["source"] = (samples, sample_rate)
+    return result
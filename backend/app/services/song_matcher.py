@@ -1,26 +1,108 @@
 # In backend/app/services/song_matcher.py
 
+import asyncio
 import httpx
-from typing import Dict, List, Any
+import numpy as np
+from typing import Dict, List, Any, Optional
 import base64
 import hmac
 import hashlib
+import random
 import time
 import os
 
 from ..config import settings
+from .audio_sample import build_identify_sample
+from .match_cache import match_cache
+from .melody_index import MelodyIndex, get_melody_index, load_chroma_sequence
+from .metrics import stage
+from .transcoder import transcoder
+
+# Status codes worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# ACRCloud's own status codes (sent with HTTP 200) that are real answers
+ACRCLOUD_SUCCESS = 0
+ACRCLOUD_NO_RESULT = 1001
+
+
+class ACRCloudError(Exception):
+    """
+    ACRCloud answered with an error status (an invalid key, an exceeded
+    quota, ...). Unlike "no result", this says nothing about the sample.
+    """
+
+    def __init__(self, code: Any, message: str):
+        super().__init__(f"ACRCloud status {code}: {message}")
+        self.code = code
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
 
 class SongMatcher:
-    def __init__(self):
-        self.host = settings.acrcloud_host
-        self.access_key = settings.acrcloud_access_key
-        self.access_secret = settings.acrcloud_access_secret
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        access_key: Optional[str] = None,
+        access_secret: Optional[str] = None,
+        scheme: str = "https",
+    ):
+        self.host = host or settings.acrcloud_host
+        self.access_key = access_key or settings.acrcloud_access_key
+        self.access_secret = access_secret or settings.acrcloud_access_secret
+        self.scheme = scheme
+        self.mode = settings.song_matcher_mode
+        self.melody_index: Optional[MelodyIndex] = None
+        self._client: Optional[httpx.AsyncClient] = None
 
-    async def match_hum_by_file(self, file_path: str) -> List[Dict[str, Any]]:
-        # This part is proven to be working perfectly.
-        if not all([self.host, self.access_key, self.access_secret]):
-            return []
-        requrl = f"https://{self.host}/v1/identify"
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = settings.acrcloud_http2 and _http2_available()
+        if settings.acrcloud_http2 and not http2:
+            print("WARNING: 'h2' is not installed, ACRCloud client falls back to HTTP/1.1")
+
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.acrcloud_max_connections,
+                max_keepalive_connections=settings.acrcloud_max_keepalive_connections,
+                keepalive_expiry=settings.acrcloud_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.acrcloud_connect_timeout,
+                read=settings.acrcloud_read_timeout,
+                write=settings.acrcloud_write_timeout,
+                pool=settings.acrcloud_pool_timeout,
+            ),
+        )
+
+    async def startup(self):
+        """Opens the shared HTTP client and loads the melody index. Called from the app lifespan."""
+        if self._client is None:
+            self._client = self._build_client()
+        if self.mode == "local_first" and self.melody_index is None:
+            self.melody_index = await asyncio.to_thread(get_melody_index, settings.melody_index_path)
+            if self.melody_index is None:
+                print("WARNING: song_matcher_mode is local_first but no melody index was found")
+
+    async def close(self):
+        """Closes the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on demand so scripts that skip the app lifespan still work.
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    def _signed_form(self, sample_size: int) -> Dict[str, str]:
         http_method = "POST"
         http_uri = "/v1/identify"
         data_type = "audio"
@@ -28,34 +110,165 @@ class SongMatcher:
         timestamp = time.time()
         string_to_sign = f"{http_method}\n{http_uri}\n{self.access_key}\n{data_type}\n{signature_version}\n{str(timestamp)}"
         sign = base64.b64encode(hmac.new(self.access_secret.encode('ascii'), string_to_sign.encode('ascii'), digestmod=hashlib.sha1).digest()).decode('ascii')
+        return {
+            'access_key': self.access_key, 'signature': sign,
+            'signature_version': signature_version, 'timestamp': str(timestamp),
+            'data_type': data_type, 'sample_bytes': str(sample_size)
+        }
+
+    async def _post_identify(self, sample: bytes, filename: str, content_type: str) -> httpx.Response:
+        """
+        Posts a sample to /v1/identify, retrying transport errors and
+        retryable status codes with full-jitter exponential backoff.
+        """
+        requrl = f"{self.scheme}://{self.host}/v1/identify"
+        attempts = settings.acrcloud_max_retries + 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                # Re-sign every attempt so the timestamp stays fresh.
+                response = await self.client.post(
+                    requrl,
+                    data=self._signed_form(len(sample)),
+                    files={'sample': (filename, sample, content_type)},
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES or last_attempt:
+                    return response
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+
+            delay = random.uniform(0, settings.acrcloud_retry_backoff_seconds * (2 ** attempt))
+            await asyncio.sleep(delay)
+
+    async def match_hum_by_file(self, file_path: str, audio_hash: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Identifies a recording stored on disk. See match_hum_by_bytes."""
+        with open(file_path, 'rb') as audio_file:
+            sample = audio_file.read()
+        return await self.match_hum_by_bytes(sample, audio_hash, filename=os.path.basename(file_path))
+
+    async def match_hum_by_pcm(
+        self,
+        pcm: np.ndarray,
+        sample_rate: int,
+        audio_hash: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Identifies mono int16 PCM. The audio is silence-trimmed, capped to the
+        identify window and downsampled before it is encoded, so only a small
+        WAV buffer goes over the wire.
+        """
+        sample = await asyncio.to_thread(
+            build_identify_sample, pcm, sample_rate,
+            settings.acrcloud_sample_seconds, settings.acrcloud_sample_rate,
+        )
+        return await self.match_hum_by_bytes(sample, audio_hash)
+
+    async def match_hum_by_bytes(
+        self,
+        sample: bytes,
+        audio_hash: Optional[str] = None,
+        filename: str = "sample.wav",
+        content_type: str = "audio/wav",
+    ) -> List[Dict[str, Any]]:
+        """
+        Identifies an encoded audio buffer. Failures are logged and come back
+        as no matches; use identify_hum to tell the two apart.
+        """
+        identified = await self.identify_hum(sample, audio_hash, filename, content_type)
+        return identified["matches"]
+
+    async def identify_hum(
+        self,
+        sample: bytes,
+        audio_hash: Optional[str] = None,
+        filename: str = "sample.wav",
+        content_type: str = "audio/wav",
+    ) -> Dict[str, Any]:
+        """
+        Identifies an encoded audio buffer and returns {"matches", "error"}.
+        error is None when the matches (possibly none) are a real answer,
+        and a message when ACRCloud could not be asked or failed. When
+        audio_hash (a hash of the normalized PCM) is given, answers are
+        served from and stored in the match cache.
+        """
+        use_cache = settings.match_cache_enabled and audio_hash is not None
+        if use_cache:
+            cached = await match_cache.get(audio_hash)
+            if cached is not None:
+                return {"matches": cached, "error": None}
+
+        if self.mode == "local_first" and self.melody_index is not None:
+            local_matches = await self._match_locally(sample)
+            if local_matches and local_matches[0]["confidence"] >= settings.local_match_threshold:
+                if use_cache:
+                    await match_cache.set(audio_hash, local_matches)
+                return {"matches": local_matches, "error": None}
+
+        # This part is proven to be working perfectly.
+        if not all([self.host, self.access_key, self.access_secret]):
+            return {"matches": [], "error": "ACRCloud is not configured"}
 
         try:
-            with open(file_path, 'rb') as audio_file:
-                files = {'sample': (os.path.basename(file_path), audio_file, 'audio/wav')}
-                data = {
-                    'access_key': self.access_key, 'signature': sign,
-                    'signature_version': signature_version, 'timestamp': str(timestamp),
-                    'data_type': data_type, 'sample_bytes': str(os.path.getsize(file_path))
-                }
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.post(requrl, data=data, files=files)
-            
-            response.raise_for_status()
-            result = response.json()
-
-            if result.get('status', {}).get('code') == 0:
-                metadata = result.get('metadata', {})
-                music_results = metadata.get('music', [])
-                if music_results:
-                    return [self._format_acrcloud_result(match, is_humming_result=False) for match in music_results]
-                humming_results = metadata.get('humming', []) 
-                if humming_results:
-                    return [self._format_acrcloud_result(match, is_humming_result=True) for match in humming_results]
-            
-            return []
+            with stage("acrcloud"):
+                matches = await self._identify(sample, filename, content_type)
         except Exception as e:
             print(f"ERROR during ACRCloud matching: {e}")
+            return {"matches": [], "error": str(e) or type(e).__name__}
+
+        # Only answers from ACRCloud (a match or "no result") are cached;
+        # errors above, including ACRCloudError, fall through uncached
+        if use_cache:
+            await match_cache.set(audio_hash, matches)
+        return {"matches": matches, "error": None}
+
+    async def _match_locally(self, sample: bytes) -> List[Dict[str, Any]]:
+        """Searches the local melody index. Any failure just means "ask ACRCloud"."""
+        try:
+            with stage("local_match"):
+                query = await transcoder.run(load_chroma_sequence, sample)
+                results = await asyncio.to_thread(self.melody_index.search, query)
+        except Exception as e:
+            print(f"ERROR during local melody matching: {e}")
+            return []
+
+        return [{
+            "title": song.get('title', 'Unknown Title'),
+            "artist": song.get('artist', 'Unknown Artist'),
+            "album": song.get('album', 'Unknown Album'),
+            "confidence": song['confidence'],
+            "source": "local_index",
+            "spotify_url": song.get('spotify_url'),
+            "youtube_url": song.get('youtube_url'),
+            "apple_music_url": song.get('apple_music_url'),
+        } for song in results]
+
+    async def _identify(self, sample: bytes, filename: str, content_type: str) -> List[Dict[str, Any]]:
+        """
+        Sends one sample to ACRCloud. Returns [] only when ACRCloud found no
+        match; raises on transport and HTTP errors and ACRCloudError on any
+        other non-zero status code.
+        """
+        response = await self._post_identify(sample, filename, content_type)
+        response.raise_for_status()
+        result = response.json()
+
+        status = result.get('status', {})
+        code = status.get('code')
+        if code == ACRCLOUD_NO_RESULT:
             return []
+        if code != ACRCLOUD_SUCCESS:
+            raise ACRCloudError(code, status.get('msg', 'unknown error'))
+
+        metadata = result.get('metadata', {})
+        music_results = metadata.get('music', [])
+        if music_results:
+            return [self._format_acrcloud_result(match, is_humming_result=False) for match in music_results]
+        humming_results = metadata.get('humming', [])
+        if humming_results:
+            return [self._format_acrcloud_result(match, is_humming_result=True) for match in humming_results]
+        return []
 
     def _format_acrcloud_result(self, acr_result: Dict[str, Any], is_humming_result: bool) -> Dict[str, Any]:
         """
@@ -0,0 +1,151 @@
+# In backend/app/services/storage_manager.py
+
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .upload_ingest import SPOOL_PREFIX
+
+# Served by the StaticFiles mount in main.py as /static/uploads
+UPLOADS_DIR = "static/uploads"
+# Only files named like this are swept, so keep checked-in examples under other names
+REMIX_PREFIX = "remix_"
+
+
+class StorageManager:
+    """
+    Keeps static/uploads bounded. Remix outputs are deleted once they are
+    older than the TTL (counting from their last use), and the least
+    recently used ones go first whenever the directory is over its disk
+    budget. Spool files left behind by crashed uploads are removed after a
+    grace period. A background task runs the sweep on an interval.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or UPLOADS_DIR
+        self.spool_directory = settings.upload_spool_dir or tempfile.gettempdir()
+        self.max_bytes = settings.storage_max_mb * 1024 * 1024
+        self.ttl_seconds = settings.storage_ttl_seconds
+        self.grace_seconds = settings.storage_orphan_grace_seconds
+        self.interval_seconds = settings.storage_sweep_interval_seconds
+        # filename -> last time it was served from the remix cache
+        self._last_used: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Any] = {
+            "bytes": 0, "files": 0, "evicted_files": 0, "evicted_bytes": 0,
+            "expired_files": 0, "orphans_removed": 0, "sweeps": 0, "last_sweep_at": None,
+        }
+
+    def touch(self, filename: str):
+        """Marks a file as recently used so LRU eviction keeps it longer."""
+        self._last_used[filename] = time.time()
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            print(f"Error removing {path}: {e}")
+            return False
+
+    def _sweep_spool(self, now: float) -> int:
+        removed = 0
+        try:
+            entries = list(os.scandir(self.spool_directory))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if not entry.name.startswith(SPOOL_PREFIX) or not entry.is_file():
+                continue
+            try:
+                if now - entry.stat().st_mtime > self.grace_seconds and self._remove(entry.path):
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def sweep(self) -> Dict[str, Any]:
+        """One blocking pass over the directory. Run it through a thread."""
+        now = time.time()
+        files: List[Tuple[float, int, str, str]] = []
+        expired = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        for entry in os.scandir(self.directory):
+            if not entry.name.startswith(REMIX_PREFIX) or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            last_used = max(stat.st_mtime, self._last_used.get(entry.name, 0))
+            if now - last_used > self.ttl_seconds:
+                if self._remove(entry.path):
+                    expired += 1
+                    self._last_used.pop(entry.name, None)
+                continue
+            files.append((last_used, stat.st_size, entry.name, entry.path))
+
+        total = sum(size for _, size, _, _ in files)
+        evicted_files = evicted_bytes = 0
+        if total > self.max_bytes:
+            for _, size, name, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    total -= size
+                    evicted_files += 1
+                    evicted_bytes += size
+                    self._last_used.pop(name, None)
+
+        # Forget usage times of files that are gone (e.g. evicted by the remix cache)
+        remaining = {name for _, _, name, _ in files}
+        for name in list(self._last_used):
+            if name not in remaining:
+                self._last_used.pop(name, None)
+
+        orphans = self._sweep_spool(now)
+
+        stats = self._stats
+        stats["bytes"] = total
+        stats["files"] = len(files) - evicted_files
+        stats["evicted_files"] += evicted_files
+        stats["evicted_bytes"] += evicted_bytes
+        stats["expired_files"] += expired
+        stats["orphans_removed"] += orphans
+        stats["sweeps"] += 1
+        stats["last_sweep_at"] = now
+        return dict(stats)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"ERROR during storage sweep: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        """Starts the background sweeper. Called from the app lifespan."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+
+storage_manager = StorageManager()
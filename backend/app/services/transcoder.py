@@ -0,0 +1,166 @@
+# In backend/app/services/transcoder.py
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from pydub import AudioSegment
+
+from ..config import settings
+from .audio_sample import WAV_HEADER_BYTES, encode_wav, resample
+from .metrics import record_stage, stage
+from .voice_activity import describe_cut, select_voiced_window
+
+
+class TranscoderBusy(Exception):
+    """Raised when the transcoding pool and its queue are both full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Audio processing is at capacity, please retry shortly")
+        self.retry_after = retry_after
+
+
+def _init_worker(converter: Optional[str]):
+    """
+    Runs once in every worker process. The ffmpeg path is configured on the
+    parent's AudioSegment, so it has to be copied over for spawned workers.
+    """
+    if converter:
+        AudioSegment.converter = converter
+
+
+def prepare_identify_sample(input_path: str, max_seconds: float, sample_rate: int) -> Dict[str, Any]:
+    """
+    Decodes an uploaded recording and builds the compact in-memory WAV that is
+    sent to ACRCloud. This runs inside a worker process, never on the event
+    loop. The input is passed by path so ffmpeg reads it from disk instead of
+    a pickled copy, and nothing is written back to disk. Per-step timings are
+    returned so the parent process can record them.
+    """
+    started = time.perf_counter()
+    sound = AudioSegment.from_file(input_path)
+    sound = sound.set_channels(1).set_frame_rate(44100).set_sample_width(2)
+    # Hash the normalized PCM, not the upload, so re-encodes of the same hum share a key
+    audio_hash = hashlib.sha256(sound.raw_data).hexdigest()
+    decoded = time.perf_counter()
+
+    # Keep only the best voiced window: smaller, and no silence for the recognizer
+    pcm = np.frombuffer(sound.raw_data, dtype=np.int16)
+    total_samples = len(pcm)
+    start, end = select_voiced_window(pcm, sound.frame_rate, max_seconds)
+    windowed = time.perf_counter()
+
+    pcm = resample(pcm[start:end], sound.frame_rate, sample_rate)
+    resampled = time.perf_counter()
+
+    sample = encode_wav(pcm, sample_rate)
+    exported = time.perf_counter()
+
+    return {
+        "sample": sample,
+        "content_type": "audio/wav",
+        "duration": len(sound) / 1000.0,
+        "audio_hash": audio_hash,
+        # Size of the full-length 44.1 kHz mono WAV, which hums record as fileSize
+        "wav_size": WAV_HEADER_BYTES + len(sound.raw_data),
+        "preprocessing": describe_cut(total_samples, start, end, sound.frame_rate),
+        "timings": {
+            "decode": decoded - started,
+            "vad": windowed - decoded,
+            "resample": resampled - windowed,
+            "export": exported - resampled,
+        },
+    }
+
+
+class Transcoder:
+    def __init__(self):
+        self.max_workers = settings.transcode_workers or os.cpu_count() or 1
+        self.max_queue = settings.transcode_max_queue
+        self.retry_after = settings.transcode_retry_after_seconds
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        # Slots are released from the pool's result thread
+        self._in_flight_lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Jobs that may be running or waiting before new work is refused."""
+        return self.max_workers + self.max_queue
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(AudioSegment.converter,),
+            )
+        return self._pool
+
+    def _release(self, future: Optional[Future]):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs a picklable, module-level function in the worker pool.
+        Raises TranscoderBusy instead of queueing without bound.
+
+        A slot is held until the pool is done with the job, not until the
+        caller stops waiting: a cancelled caller only gives its slot back
+        once the job could be cancelled before it started, or has finished.
+        """
+        with self._in_flight_lock:
+            if self._in_flight >= self.capacity:
+                raise TranscoderBusy(self.retry_after)
+            self._in_flight += 1
+
+        pool = self._get_pool()
+        try:
+            try:
+                future = pool.submit(func, *args)
+            except BaseException:
+                self._release(None)
+                raise
+            future.add_done_callback(self._release)
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # A worker died (e.g. ffmpeg crashed hard); start a fresh pool next time.
+            if self._pool is pool:
+                print("ERROR: transcoder worker pool broke, recreating it")
+                self._pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    async def prepare_identify_sample(self, input_path: str) -> Dict[str, Any]:
+        """Converts a spooled upload to the compact sample used for matching."""
+        with stage("transcode"):
+            prepared = await self.run(
+                prepare_identify_sample, input_path,
+                settings.acrcloud_sample_seconds, settings.acrcloud_sample_rate,
+            )
+        for name, seconds in prepared["timings"].items():
+            record_stage(name, seconds)
+        return prepared
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.max_workers),
+            "capacity": self.capacity,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+transcoder = Transcoder()
@@ -0,0 +1,260 @@
+# In backend/app/services/upload_ingest.py
+
+import asyncio
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import BinaryIO, List, Optional
+
+from fastapi import UploadFile
+
+from ..config import settings
+from .metrics import stage
+
+CHUNK_SIZE = 1024 * 1024
+SPOOL_PREFIX = "hummify_upload_"
+
+
+class UploadTooLarge(Exception):
+    """Raised as soon as an upload is known to exceed the size limit."""
+
+    def __init__(self, max_bytes: int, what: str = "Audio file"):
+        super().__init__(f"{what} is larger than the {max_bytes // (1024 * 1024)} MB limit")
+        self.max_bytes = max_bytes
+
+
+class InvalidBatch(Exception):
+    """A batch upload that cannot be processed: too many files, a bad archive, ..."""
+
+
+class SpooledUpload:
+    """An upload copied to a private temp file, with its size and SHA-256."""
+
+    def __init__(self, path: str, size: int, sha256: str, filename: Optional[str]):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.filename = filename
+
+    def cleanup(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def max_upload_bytes() -> int:
+    return settings.max_audio_size_mb * 1024 * 1024
+
+
+def max_batch_bytes() -> int:
+    return settings.batch_max_total_mb * 1024 * 1024
+
+
+def _new_spool_file(filename: Optional[str]):
+    suffix = os.path.splitext(filename or "")[1][:10]
+    return tempfile.mkstemp(prefix=SPOOL_PREFIX, suffix=suffix, dir=settings.upload_spool_dir)
+
+
+def _link_spool_file(source_path: str, filename: Optional[str]) -> Optional[str]:
+    """Hard-links a file into the spool dir; None if that is not possible."""
+    fd, path = _new_spool_file(filename)
+    os.close(fd)
+    os.remove(path)
+    try:
+        os.link(source_path, path)
+    except OSError:
+        return None
+    return path
+
+
+def _copy_file(source: BinaryIO, out: BinaryIO, size: int):
+    """Copies `size` bytes from the start of source inside the kernel where possible."""
+    try:
+        offset = 0
+        while offset < size:
+            offset += os.sendfile(out.fileno(), source.fileno(), offset, size - offset)
+    except (AttributeError, OSError):
+        # No file-to-file sendfile (e.g. macOS): copy in user space
+        source.seek(0)
+        out.seek(0)
+        out.truncate()
+        shutil.copyfileobj(source, out, CHUNK_SIZE)
+
+
+def _adopt_rolled_file(source: BinaryIO, filename: Optional[str], max_bytes: int) -> SpooledUpload:
+    """
+    Takes over an upload that Starlette already spooled to a temp file on
+    disk. A named file is hard-linked into the spool dir, so nothing is
+    copied. Linux rolls uploads into anonymous O_TMPFILE files, which cannot
+    be linked; those are hashed through mmap and copied by the kernel, so
+    no chunk passes through Python. Blocking; run it in a thread.
+    """
+    size = os.fstat(source.fileno()).st_size
+    if size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    digest = hashlib.sha256()
+    if size:
+        with mmap.mmap(source.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+
+    name = getattr(source, "name", None)
+    path = _link_spool_file(name, filename) if isinstance(name, str) else None
+    if path is None:
+        fd, path = _new_spool_file(filename)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                _copy_file(source, out, size)
+        except BaseException:
+            os.remove(path)
+            raise
+    return SpooledUpload(path, size, digest.hexdigest(), filename)
+
+
+async def spool_upload(upload: UploadFile, max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Gives the decoder a private file it can read by path. Uploads Starlette
+    has already rolled over to disk are taken over as they are (see
+    _adopt_rolled_file); small in-memory ones are written out chunk by
+    chunk, hashing as they go.
+    """
+    max_bytes = max_bytes or max_upload_bytes()
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    if getattr(upload.file, "_rolled", False):
+        with stage("upload_spool"):
+            return await asyncio.to_thread(_adopt_rolled_file, upload.file, upload.filename, max_bytes)
+
+    fd, path = _new_spool_file(upload.filename)
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with stage("upload_spool"), os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return SpooledUpload(path, size, digest.hexdigest(), upload.filename)
+
+
+def _spool_stream(source: BinaryIO, filename: str, max_bytes: int) -> SpooledUpload:
+    """Blocking counterpart of spool_upload for a file-like object."""
+    fd, path = _new_spool_file(filename)
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return SpooledUpload(path, size, digest.hexdigest(), filename)
+
+
+def _is_audio_member(member: zipfile.ZipInfo) -> bool:
+    name = os.path.basename(member.filename)
+    if member.is_dir() or not name or name.startswith(".") or "__MACOSX" in member.filename:
+        return False
+    return os.path.splitext(name)[1].lower().lstrip(".") in settings.supported_audio_formats
+
+
+def extract_zip(path: str, max_items: int, max_file_bytes: int, max_total_bytes: int) -> List[SpooledUpload]:
+    """
+    Spools the audio files in a zip archive (by extension; everything else
+    is skipped) to their own temp files. Sizes are enforced on the
+    decompressed bytes as they are written, not on what the archive claims.
+    Blocking; run it in a thread.
+    """
+    uploads: List[SpooledUpload] = []
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = [member for member in archive.infolist() if _is_audio_member(member)]
+            if not members:
+                raise InvalidBatch("The archive contains no supported audio files")
+            if len(members) > max_items:
+                raise InvalidBatch(f"The archive has {len(members)} audio files; the limit is {max_items}")
+
+            total = 0
+            for member in members:
+                with archive.open(member) as source:
+                    upload = _spool_stream(source, os.path.basename(member.filename), max_file_bytes)
+                uploads.append(upload)
+                total += upload.size
+                if total > max_total_bytes:
+                    raise UploadTooLarge(max_total_bytes, "Batch")
+    except zipfile.BadZipFile as e:
+        for upload in uploads:
+            upload.cleanup()
+        raise InvalidBatch(f"Not a valid zip archive: {e}")
+    except BaseException:
+        for upload in uploads:
+            upload.cleanup()
+        raise
+    return uploads
+
+
+async def spool_batch(files: List[UploadFile], archive: Optional[UploadFile]) -> List[SpooledUpload]:
+    """
+    Spools every file of a batch upload, plus the audio inside an optional
+    zip archive, within the per-file, per-batch and item-count limits.
+    """
+    max_items = settings.batch_max_items
+    max_total = max_batch_bytes()
+    if len(files) > max_items:
+        raise InvalidBatch(f"{len(files)} files were sent; the limit is {max_items}")
+
+    uploads: List[SpooledUpload] = []
+    try:
+        for upload_file in files:
+            upload = await spool_upload(upload_file)
+            uploads.append(upload)
+            max_total -= upload.size
+            if max_total < 0:
+                raise UploadTooLarge(max_batch_bytes(), "Batch")
+
+        if archive is not None:
+            try:
+                spooled_archive = await spool_upload(archive, max(1, max_total))
+            except UploadTooLarge:
+                raise UploadTooLarge(max_batch_bytes(), "Batch")
+            try:
+                with stage("upload_unzip"):
+                    uploads += await asyncio.to_thread(
+                        extract_zip, spooled_archive.path, max_items - len(uploads),
+                        max_upload_bytes(), max_total,
+                    )
+            finally:
+                spooled_archive.cleanup()
+    except BaseException:
+        for upload in uploads:
+            upload.cleanup()
+        raise
+
+    if not uploads:
+        raise InvalidBatch("No audio files were sent")
+    return uploads
@@ -0,0 +1,77 @@
+# In backend/app/services/voice_activity.py
+#
+# Energy-based voice activity detection for identify samples. Frames the
+# PCM once, marks voiced frames against both the loudest frame and the
+# recording's own noise floor, and picks the N-second window with the most
+# voiced audio using cumulative sums. NumPy only, like audio_sample.
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+FRAME_MS = 20
+
+
+def frame_rms(pcm: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> Tuple[np.ndarray, int]:
+    """RMS of consecutive non-overlapping frames, and the frame length in samples."""
+    frame = max(1, sample_rate * frame_ms // 1000)
+    n_frames = len(pcm) // frame
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32), frame
+    frames = pcm[:n_frames * frame].astype(np.float32).reshape(n_frames, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1)), frame
+
+
+def voiced_mask(rms: np.ndarray, top_db: float = 30.0, floor_margin_db: float = 6.0) -> np.ndarray:
+    """
+    Frames that are within `top_db` of the loudest frame and at least
+    `floor_margin_db` above the noise floor (the 10th percentile frame), so
+    steady background hiss does not count as voice.
+    """
+    if len(rms) == 0 or rms.max() <= 0:
+        return np.zeros(len(rms), dtype=bool)
+    noise_floor = np.percentile(rms, 10)
+    threshold = max(rms.max() * 10 ** (-top_db / 20), noise_floor * 10 ** (floor_margin_db / 20))
+    return rms > threshold
+
+
+def select_voiced_window(
+    pcm: np.ndarray,
+    sample_rate: int,
+    window_seconds: float,
+    top_db: float = 30.0,
+) -> Tuple[int, int]:
+    """
+    Returns (start, end) sample offsets of the best `window_seconds` of
+    audio: the window with the most voiced frames, louder voiced audio
+    breaking ties, with unvoiced frames at either edge dropped. A recording
+    with no voiced frames is returned whole, capped to the window.
+    """
+    max_samples = int(window_seconds * sample_rate)
+    rms, frame = frame_rms(pcm, sample_rate)
+    voiced = voiced_mask(rms, top_db)
+    if not voiced.any():
+        return 0, min(len(pcm), max_samples)
+
+    window = max(1, max_samples // frame)
+    first, last = np.flatnonzero(voiced)[[0, -1]]
+    if last - first + 1 > window:
+        # Voiced frames count for 1 each; their loudness adds less than 1
+        # in total, so it only decides between equally voiced windows
+        score = voiced + (rms * voiced) / (rms.max() * window)
+        sums = np.concatenate(([0.0], np.cumsum(score)))
+        start = int(np.argmax(sums[window:] - sums[:-window]))
+        inside = np.flatnonzero(voiced[start:start + window]) + start
+        first, last = inside[0], inside[-1]
+
+    return int(first * frame), int(min((last + 1) * frame, len(pcm)))
+
+
+def describe_cut(total_samples: int, start: int, end: int, sample_rate: int) -> Dict[str, Any]:
+    """How much of a recording a selected window kept, in seconds."""
+    return {
+        "input_seconds": round(total_samples / sample_rate, 3),
+        "sample_seconds": round((end - start) / sample_rate, 3),
+        "window_start_seconds": round(start / sample_rate, 3),
+        "cut_seconds": round((total_samples - (end - start)) / sample_rate, 3),
+    }
@@ -0,0 +1,89 @@
+# In backend/benchmarks/bench_cold_start.py
+#
+# Cold-start cost of the API: `python -X importtime` for `import app.main`
+# (total and the slowest top-level imports), and the wall time from
+# spawning uvicorn to the first successful GET /health.
+#
+#   cd backend && python -m benchmarks.bench_cold_start --runs 5
+
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def import_times(module: str):
+    """Returns {module: cumulative microseconds} from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_health(client: httpx.Client, timeout: float = 60.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError("server did not answer /health in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(args):
+    runs = [import_times("app.main") for _ in range(args.runs)]
+    total_ms = statistics.median(run["app.main"] for run in runs) / 1000
+    print(f"import app.main          median={total_ms:8.1f}ms over {args.runs} runs")
+
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    shown = 0
+    for name, cumulative in slowest:
+        # Top-level packages only, to keep the list readable
+        if "." in name or name == "app":
+            continue
+        print(f"    {name:<28} {cumulative / 1000:8.1f}ms")
+        shown += 1
+        if shown == args.top:
+            break
+
+    # One client for all probes: building one per probe costs more CPU
+    # than the server's own start-up steps
+    with httpx.Client(timeout=1.0) as client:
+        health = [time_to_first_health(client) for _ in range(args.runs)]
+    print(f"time to first /health    median={1000 * statistics.median(health):8.1f}ms "
+          f"min={1000 * min(health):.1f}ms max={1000 * max(health):.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import time and time-to-first-/health of the API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="how many slow top-level imports to list")
+    main(parser.parse_args())
@@ -0,0 +1,60 @@
+# In backend/benchmarks/bench_counters.py
+#
+# Counts user-document writes for a burst of stat increments, written one
+# Firestore update per event versus through the CounterAggregator.
+#
+#   cd backend && python -m benchmarks.bench_counters --events 5000 --users 50
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+from app.services.counter_aggregator import CounterAggregator
+
+
+async def main(args):
+    latency = args.write_latency
+    per_event_writes = Counter()
+    aggregated_writes = Counter()
+    events = [(f"user-{random.randrange(args.users)}", random.choice(("totalHums", "songsIdentified")))
+              for _ in range(args.events)]
+
+    async def write_one(uid):
+        await asyncio.sleep(latency)
+        per_event_writes[uid] += 1
+
+    async def write_batch(deltas):
+        await asyncio.sleep(latency)
+        for uid in deltas:
+            aggregated_writes[uid] += 1
+
+    start = time.perf_counter()
+    for uid, _ in events:
+        await write_one(uid)
+    per_event_seconds = time.perf_counter() - start
+
+    aggregator = CounterAggregator(write_batch, args.interval, max_pending=400, batch_size=500)
+    aggregator.start()
+    for i, (uid, stat_name) in enumerate(events):
+        aggregator.add(uid, stat_name)
+        if i % args.events_per_tick == 0:
+            # Events arrive over time rather than all at once
+            await asyncio.sleep(0.001)
+    await aggregator.stop()
+
+    print(f"{'per-event update':<24} user-doc writes={sum(per_event_writes.values()):<6} "
+          f"hottest doc={max(per_event_writes.values()):<5} time writing={per_event_seconds:.2f}s")
+    print(f"{'aggregated':<24} user-doc writes={sum(aggregated_writes.values()):<6} "
+          f"hottest doc={max(aggregated_writes.values()):<5} batches={aggregator.flushes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-event vs aggregated counter writes")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.25, help="aggregator flush interval in seconds")
+    parser.add_argument("--events-per-tick", type=int, default=20)
+    parser.add_argument("--write-latency", type=float, default=0.0005, help="simulated write round-trip in seconds")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+# In backend/benchmarks/bench_features.py
+#
+# CPU time per clip of AudioProcessor's feature extraction: the previous
+# one-STFT-per-feature version (kept below as the reference) and the shared
+# single-STFT extract_features. Also checks that both versions produce the
+# same feature values.
+#
+#   cd backend && python -m benchmarks.bench_features --repeat 3
+
+import argparse
+import glob
+import os
+import time
+from typing import Any, Dict, List
+
+import librosa
+import numpy as np
+
+from app.services.audio_processor import audio_processor, extract_features
+from app.services.storage_manager import UPLOADS_DIR
+
+
+def per_feature_stft(audio_data: np.ndarray, sr: int) -> Dict[str, Any]:
+    """The extraction as it was: every librosa call starts from the samples."""
+    features = {}
+    spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sr)[0]
+    features["spectral_centroid_mean"] = float(np.mean(spectral_centroids))
+    features["spectral_centroid_std"] = float(np.std(spectral_centroids))
+    tempo, beats = librosa.beat.beat_track(y=audio_data, sr=sr)
+    features["tempo"] = float(np.atleast_1d(tempo)[0])
+    features["beat_count"] = len(beats)
+    chroma = librosa.feature.chroma_stft(y=audio_data, sr=sr)
+    features["chroma_mean"] = chroma.mean(axis=1).tolist()
+    features["chroma_std"] = chroma.std(axis=1).tolist()
+    mfccs = librosa.feature.mfcc(y=audio_data, sr=sr, n_mfcc=13)
+    features["mfcc_mean"] = mfccs.mean(axis=1).tolist()
+    features["mfcc_std"] = mfccs.std(axis=1).tolist()
+    zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
+    features["zcr_mean"] = float(np.mean(zcr))
+    features["zcr_std"] = float(np.std(zcr))
+    rolloff = librosa.feature.spectral_rolloff(y=audio_data, sr=sr)[0]
+    features["spectral_rolloff_mean"] = float(np.mean(rolloff))
+    features["spectral_rolloff_std"] = float(np.std(rolloff))
+    rms = librosa.feature.rms(y=audio_data)[0]
+    features["rms_mean"] = float(np.mean(rms))
+    features["rms_std"] = float(np.std(rms))
+    return features
+
+
+def max_relative_difference(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    worst = 0.0
+    for key, value in a.items():
+        x, y = np.atleast_1d(np.asarray(value, dtype=float)), np.atleast_1d(np.asarray(b[key], dtype=float))
+        worst = max(worst, float(np.max(np.abs(x - y) / np.maximum(np.abs(x), 1e-9))))
+    return worst
+
+
+def load_clips(sr: int, max_seconds: int) -> List[np.ndarray]:
+    clips = []
+    for path in sorted(glob.glob(os.path.join(UPLOADS_DIR, "*.wav"))):
+        audio_data, _ = librosa.load(path, sr=sr)
+        audio_data, _ = librosa.effects.trim(audio_data, top_db=20)
+        clips.append(audio_data[:max_seconds * sr])
+    return clips
+
+
+def cpu_seconds(func, *args) -> float:
+    start = time.process_time()
+    func(*args)
+    return time.process_time() - start
+
+
+def main(args):
+    sr = audio_processor.sample_rate
+    clips = load_clips(sr, audio_processor.max_duration)
+    if not clips:
+        raise SystemExit(f"No WAV files found in {UPLOADS_DIR}")
+    audio_seconds = sum(len(clip) for clip in clips) / sr
+
+    # First calls compile librosa's numba kernels and fill its caches
+    per_feature_stft(clips[0], sr)
+    extract_features(clips[0], sr)
+
+    difference = max(max_relative_difference(per_feature_stft(clip, sr), extract_features(clip, sr)) for clip in clips)
+
+    timings = {"per-feature STFT": [], "single STFT": []}
+    for _ in range(args.repeat):
+        timings["per-feature STFT"].append(cpu_seconds(lambda: [per_feature_stft(clip, sr) for clip in clips]))
+        timings["single STFT"].append(cpu_seconds(lambda: [extract_features(clip, sr) for clip in clips]))
+
+    print(f"{len(clips)} clips, {audio_seconds:.1f}s of audio, max relative feature difference {difference:.2e}")
+    baseline = min(timings["per-feature STFT"]) / len(clips)
+    for label, runs in timings.items():
+        per_clip = min(runs) / len(clips)
+        print(f"{label:<24} cpu/clip={per_clip * 1000:8.1f}ms  vs per-feature={per_clip / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-feature STFTs vs one shared STFT")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant; the fastest is reported")
+    main(parser.parse_args())
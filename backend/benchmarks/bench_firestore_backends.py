@@ -0,0 +1,63 @@
+# In backend/benchmarks/bench_firestore_backends.py
+#
+# Profile reads at rising concurrency through the threaded backend (a
+# blocking fake client that sleeps for the round-trip in a pool thread)
+# and the memory backend (which awaits the round-trip on the event loop,
+# as the async client does). Reports latency, throughput and peak threads.
+#
+#   cd backend && python -m benchmarks.bench_firestore_backends --concurrency 8,32,128 --latency 0.02
+
+import argparse
+import asyncio
+import threading
+import time
+
+from app.services.firestore_backend import MemoryBackend, ThreadedBackend
+from benchmarks.fakes import FakeFirestore
+from benchmarks.stats import summarize, format_row
+
+USERS = 100
+
+
+async def run_level(backend, concurrency: int, requests: int):
+    latencies = []
+    peak_threads = threading.active_count()
+    next_index = iter(range(requests))
+
+    async def client():
+        nonlocal peak_threads
+        for i in next_index:
+            start = time.perf_counter()
+            await backend.get("users", f"user-{i % USERS}")
+            latencies.append(time.perf_counter() - start)
+            peak_threads = max(peak_threads, threading.active_count())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started, peak_threads
+
+
+async def main(args):
+    fake = FakeFirestore(latency=args.latency)
+    backends = {
+        "threaded": ThreadedBackend(lambda: fake, args.max_concurrency),
+        "memory": MemoryBackend(args.max_concurrency, latency=args.latency),
+    }
+    for backend in backends.values():
+        for i in range(USERS):
+            await backend.set("users", f"user-{i}", {"totalHums": i})
+
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        for name, backend in backends.items():
+            latencies, elapsed, peak_threads = await run_level(backend, concurrency, args.requests)
+            print(format_row(f"{name} c={concurrency}", summarize(latencies)))
+            print(f"{'':<24} throughput={len(latencies) / elapsed:.0f} req/s peak_threads={peak_threads}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Threaded vs async-style Firestore backend")
+    parser.add_argument("--concurrency", default="8,32,128,512", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=2000, help="reads per level and backend")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated round-trip in seconds")
+    parser.add_argument("--max-concurrency", type=int, default=256, help="backend in-flight limit")
+    asyncio.run(main(parser.parse_args()))
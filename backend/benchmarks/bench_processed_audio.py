@@ -0,0 +1,68 @@
+# In backend/benchmarks/bench_processed_audio.py
+#
+# Memory and time to hand off a processed 30 s clip: the old list of Python
+# floats (plus its JSON encoding) versus ProcessedAudio's array, raw bytes
+# and .npy output, in float32 and compacted to int16.
+#
+#   cd backend && python -m benchmarks.bench_processed_audio
+
+import argparse
+import glob
+import json
+import os
+import time
+import tracemalloc
+
+import librosa
+import numpy as np
+
+from app.services.audio_processor import audio_processor, ProcessedAudio
+from app.services.storage_manager import UPLOADS_DIR
+
+
+def measure(label: str, func, repeat: int):
+    """Peak traced allocation and best wall time of func(), plus its output size."""
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    size = len(result) if isinstance(result, (bytes, str)) else None
+    output = f"output={size / 1e6:7.2f}MB" if size is not None else ""
+    print(f"{label:<28} time={best * 1000:8.2f}ms peak_alloc={peak / 1e6:7.2f}MB {output}")
+
+
+def main(args):
+    sr = audio_processor.sample_rate
+    paths = sorted(glob.glob(os.path.join(UPLOADS_DIR, "*.wav")))
+    if not paths:
+        raise SystemExit(f"No WAV files found in {UPLOADS_DIR}")
+    audio_data, _ = librosa.load(paths[0], sr=sr)
+    # A full-length clip, as process_audio_file returns at most
+    audio_data = np.resize(audio_data, audio_processor.max_duration * sr)
+    print(f"{len(audio_data)} samples ({len(audio_data) / sr:.0f}s at {sr} Hz), {audio_data.nbytes / 1e6:.2f}MB as float32")
+
+    audio = ProcessedAudio(audio_data, sr)
+    compact = audio.compact("int16")
+    measure("tolist()", lambda: audio_data.tolist(), args.repeat)
+    measure("json.dumps(tolist())", lambda: json.dumps(audio_data.tolist()), args.repeat)
+    measure("ProcessedAudio", lambda: ProcessedAudio(audio_data, sr), args.repeat)
+    measure("ProcessedAudio.tobytes()", audio.tobytes, args.repeat)
+    measure("ProcessedAudio.to_npy()", audio.to_npy, args.repeat)
+    measure("compact(int16)", lambda: audio.compact("int16"), args.repeat)
+    measure("compact(int16).to_npy()", compact.to_npy, args.repeat)
+
+    restored = ProcessedAudio.from_npy(compact.to_npy(), sr).as_float32()
+    print(f"int16 round trip: max abs error {np.max(np.abs(restored - np.clip(audio_data, -1, 1))):.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List of floats vs ProcessedAudio")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per variant; the fastest is reported")
+    main(parser.parse_args())
@@ -0,0 +1,73 @@
+# In backend/benchmarks/bench_remix_source.py
+#
+# Is caching decoded /remix sources worth it? Compares, in a worker
+# process, decoding an MP3 again against sending the decoded float32
+# samples over the process pool: back from render_remix (worker ->
+# parent) and into render_decoded (parent -> worker). Recordings are the
+# first upload looped to each length, as 44.1 kHz stereo MP3s.
+#
+#   cd backend && python -m benchmarks.bench_remix_source --seconds 30,180,600
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pydub import AudioSegment
+
+from app.services.remix_engine import decode_audio
+from app.services.storage_manager import UPLOADS_DIR
+
+
+def decode_only(path: str) -> int:
+    """Decodes in the worker and returns nothing large."""
+    samples, _ = decode_audio(path)
+    return samples.nbytes
+
+
+def decode_and_return(path: str):
+    return decode_audio(path)
+
+
+def receive(samples: np.ndarray, sample_rate: int) -> int:
+    return samples.nbytes
+
+
+def best_of(repeat: int, func, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    paths = sorted(glob.glob(os.path.join(UPLOADS_DIR, "*.wav")))
+    if not paths:
+        raise SystemExit(f"No WAV files found in {UPLOADS_DIR}")
+    clip = AudioSegment.from_file(paths[0]).set_frame_rate(44100).set_channels(2)
+
+    with tempfile.TemporaryDirectory() as tmp, ProcessPoolExecutor(max_workers=1) as pool:
+        pool.submit(decode_only, paths[0]).result()
+        print(f"{'length':>7} {'decoded':>9} {'re-decode':>10} {'decode+return':>14} {'return only':>12} {'send to worker':>15}")
+        for seconds in (int(s) for s in args.seconds.split(",")):
+            path = os.path.join(tmp, f"{seconds}.mp3")
+            (clip * (seconds * 1000 // len(clip) + 1))[:seconds * 1000].export(path, format="mp3")
+            samples, sample_rate = decode_audio(path)
+
+            redecode = best_of(args.repeat, lambda: pool.submit(decode_only, path).result())
+            decode_return = best_of(args.repeat, lambda: pool.submit(decode_and_return, path).result())
+            send = best_of(args.repeat, lambda: pool.submit(receive, samples, sample_rate).result())
+            print(f"{seconds:>6}s {samples.nbytes / 1e6:>7.1f}MB {redecode * 1000:>8.0f}ms "
+                  f"{decode_return * 1000:>12.0f}ms {(decode_return - redecode) * 1000:>10.0f}ms {send * 1000:>13.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Decoded source IPC vs re-decode")
+    parser.add_argument("--seconds", default="30,180,600", help="comma-separated recording lengths")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant; the fastest is reported")
+    main(parser.parse_args())
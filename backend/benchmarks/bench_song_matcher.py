@@ -0,0 +1,77 @@
+# In backend/benchmarks/bench_song_matcher.py
+#
+# Compares the old one-client-per-request behaviour of SongMatcher with the
+# pooled, long-lived client against a local fake ACRCloud server.
+#
+#   cd backend && python -m benchmarks.bench_song_matcher --requests 200 --concurrency 8
+
+import argparse
+import asyncio
+import glob
+import time
+
+import httpx
+
+from app.services.song_matcher import SongMatcher
+from benchmarks.fake_acrcloud import FakeACRCloudServer
+from benchmarks.stats import summarize, format_row
+
+
+class PerRequestClientMatcher(SongMatcher):
+    """The previous behaviour: a brand-new AsyncClient for every identification."""
+
+    async def _post_identify(self, sample, filename, content_type):
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await client.post(
+                f"{self.scheme}://{self.host}/v1/identify",
+                data=self._signed_form(len(sample)),
+                files={'sample': (filename, sample, content_type)},
+            )
+
+
+async def run_matcher(matcher: SongMatcher, sample_path: str, requests: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            matches = await matcher.match_hum_by_file(sample_path)
+            latencies.append(time.perf_counter() - start)
+            assert matches, "fake server should always return a match"
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, time.perf_counter() - started
+
+
+async def main(args):
+    server = FakeACRCloudServer(latency=args.latency)
+    await server.start()
+
+    sample_path = sorted(glob.glob("static/uploads/*.wav"))[0]
+    credentials = dict(host=server.address, access_key="bench", access_secret="bench", scheme="http")
+
+    try:
+        for label, matcher in (
+            ("per-request client", PerRequestClientMatcher(**credentials)),
+            ("pooled client", SongMatcher(**credentials)),
+        ):
+            server.reset_counters()
+            await matcher.startup()
+            latencies, elapsed = await run_matcher(matcher, sample_path, args.requests, args.concurrency)
+            await matcher.close()
+
+            print(format_row(label, summarize(latencies)))
+            print(f"{'':<24} connections={server.connections} requests={server.requests} "
+                  f"throughput={args.requests / elapsed:.1f} req/s")
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pooled vs per-request ACRCloud client benchmark")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005, help="fake server latency in seconds")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,95 @@
+# In backend/benchmarks/bench_upload_pipeline.py
+#
+# Time-to-response of the /upload-and-match pipeline with local stubs: a
+# fake ACRCloud server and an in-memory Firestore with simulated latency.
+# Compares the previous strictly sequential ordering with HumPipeline,
+# which overlaps the profile lookup with transcode + identify and commits
+# the hum after the response.
+#
+#   cd backend && python -m benchmarks.bench_upload_pipeline --uploads 30 --firestore-latency 0.08
+
+import os
+
+os.environ.setdefault("MATCH_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import glob
+import time
+
+from app.services import hum_pipeline as hum_pipeline_module
+from app.services.hum_pipeline import HumPipeline
+from app.services.song_matcher import song_matcher
+from app.services.transcoder import transcoder
+from benchmarks.fake_acrcloud import FakeACRCloudServer
+from benchmarks.fakes import FakeFirebaseService
+from benchmarks.stats import summarize, format_row
+
+
+class SequentialHumPipeline(HumPipeline):
+    """The previous handler: every step awaited in turn before responding."""
+
+    async def run(self, upload_path, title, user, schedule_background=None):
+        identified = await self.identify(upload_path)
+        await self.ensure_profile(user)
+        hum_data = self.build_hum_data(
+            user, title, identified["prepared"]["wav_size"], identified["matches"], identified["error"]
+        )
+        hum_id = hum_pipeline_module.firebase_service.new_hum_id()
+        done = asyncio.get_running_loop().create_future()
+        done.set_result(True)
+        await self.persist(hum_id, hum_data, user["uid"], done)
+        return {"hum_id": hum_id, "matches": identified["matches"]}
+
+
+async def run_pipeline(pipeline: HumPipeline, fake_db: FakeFirebaseService, sample_path: str, uploads: int):
+    latencies = []
+    background = []
+
+    for i in range(uploads):
+        # A new user every time, so the profile has to be created too
+        user = {"uid": f"user-{i}", "email": f"user{i}@example.com", "name": "Bench"}
+        start = time.perf_counter()
+        result = await pipeline.run(
+            sample_path, "bench", user,
+            schedule_background=lambda func, *args: background.append(func(*args)),
+        )
+        latencies.append(time.perf_counter() - start)
+        assert result["matches"], "fake server should always return a match"
+        # Stands in for Starlette running the task after the response
+        while background:
+            await background.pop()
+
+    assert len(fake_db.hums) == uploads
+    return latencies
+
+
+async def main(args):
+    server = FakeACRCloudServer(latency=args.acrcloud_latency)
+    await server.start()
+    song_matcher.host, song_matcher.scheme = server.address, "http"
+    song_matcher.access_key = song_matcher.access_secret = "bench"
+
+    fake_db = FakeFirebaseService(latency=args.firestore_latency)
+    hum_pipeline_module.firebase_service = fake_db
+    sample_path = sorted(glob.glob("static/uploads/*.wav"))[0]
+
+    try:
+        # Warm the worker pool so process start-up is not measured
+        await transcoder.prepare_identify_sample(sample_path)
+        for label, pipeline in (("sequential", SequentialHumPipeline()), ("overlapped", HumPipeline())):
+            fake_db.reset()
+            latencies = await run_pipeline(pipeline, fake_db, sample_path, args.uploads)
+            print(format_row(label, summarize(latencies)))
+    finally:
+        await song_matcher.close()
+        await server.stop()
+        transcoder.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs overlapped /upload-and-match pipeline")
+    parser.add_argument("--uploads", type=int, default=30)
+    parser.add_argument("--firestore-latency", type=float, default=0.08, help="simulated Firestore round-trip in seconds")
+    parser.add_argument("--acrcloud-latency", type=float, default=0.3, help="fake ACRCloud latency in seconds")
+    asyncio.run(main(parser.parse_args()))
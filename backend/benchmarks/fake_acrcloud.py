@@ -0,0 +1,178 @@
+# In backend/benchmarks/fake_acrcloud.py
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import re
+from typing import Dict, Optional
+
+# A canned humming match in the same shape ACRCloud returns.
+FAKE_RESULT = {
+    "status": {"code": 0, "msg": "Success"},
+    "metadata": {
+        "humming": [{
+            "title": "Fake Song",
+            "artists": [{"name": "Fake Artist"}],
+            "album": {"name": "Fake Album"},
+            "score": 0.82,
+            "external_metadata": {"youtube": {"vid": "dQw4w9WgXcQ"}},
+        }]
+    },
+}
+
+
+# What ACRCloud answers (with HTTP 200) for a bad key or signature.
+INVALID_SIGNATURE = {"status": {"code": 3014, "msg": "Invalid signature"}}
+
+
+def parse_multipart(body: bytes, content_type: str) -> Dict[str, bytes]:
+    """Splits a multipart/form-data body into {field name: raw value}."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        return {}
+    fields = {}
+    for part in body.split(b"--" + match.group(1).encode())[1:]:
+        if part.startswith(b"--"):
+            break
+        head, _, value = part[2:].partition(b"\r\n\r\n")
+        name = re.search(rb'name="([^"]*)"', head)
+        if name:
+            # Drop the CRLF that precedes the next boundary
+            fields[name.group(1).decode()] = value[:-2] if value.endswith(b"\r\n") else value
+    return fields
+
+
+class FakeACRCloudServer:
+    """
+    A tiny HTTP/1.1 server that answers POST /v1/identify with a canned match.
+    It counts TCP connections and requests so benchmarks can show pooling.
+    Given access_key and access_secret it also checks the signed form the
+    way ACRCloud does (HMAC-SHA1 over method, URI, key, data type, version
+    and timestamp, plus sample_bytes) and rejects bad requests.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        access_key: Optional[str] = None,
+        access_secret: Optional[str] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.access_key = access_key
+        self.access_secret = access_secret
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def reset_counters(self):
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+
+    def verify(self, fields: Dict[str, bytes]) -> bool:
+        """Checks a parsed identify form against the configured credentials."""
+        if self.access_key is None:
+            return "sample" in fields
+        try:
+            form = {name: fields[name].decode() for name in (
+                "access_key", "signature", "signature_version", "timestamp", "data_type", "sample_bytes"
+            )}
+        except (KeyError, UnicodeDecodeError):
+            return False
+        string_to_sign = "\n".join((
+            "POST", "/v1/identify", form["access_key"], form["data_type"],
+            form["signature_version"], form["timestamp"],
+        ))
+        expected = base64.b64encode(hmac.new(
+            self.access_secret.encode("ascii"), string_to_sign.encode("ascii"), digestmod=hashlib.sha1
+        ).digest()).decode("ascii")
+        return (
+            form["access_key"] == self.access_key
+            and hmac.compare_digest(form["signature"], expected)
+            and form["sample_bytes"] == str(len(fields.get("sample", b"")))
+        )
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict) -> bytes:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int((await reader.readline()).strip(), 16)
+                if size == 0:
+                    await reader.readline()
+                    return body
+                body += await reader.readexactly(size)
+                await reader.readline()
+        length = int(headers.get("content-length", 0))
+        return await reader.readexactly(length) if length else b""
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await self._read_body(reader, headers)
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                if method == "POST" and path == "/v1/identify" and body:
+                    fields = parse_multipart(body, headers.get("content-type", ""))
+                    if self.verify(fields):
+                        result = FAKE_RESULT
+                    else:
+                        self.rejected += 1
+                        result = INVALID_SIGNATURE
+                    status, payload = "200 OK", json.dumps(result).encode()
+                else:
+                    status, payload = "404 Not Found", b'{"status": {"code": 404}}'
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"\r\n".encode() + payload
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        except asyncio.CancelledError:
+            # Idle keep-alive connections are cancelled when the loop shuts down
+            pass
+        finally:
+            writer.close()
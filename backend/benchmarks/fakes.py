@@ -0,0 +1,185 @@
+# In backend/benchmarks/fakes.py
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeFirebaseService:
+    """
+    An in-memory stand-in for FirebaseService with the methods the hum
+    endpoints use. Every call sleeps for `latency` seconds to model a
+    Firestore round-trip, and the calls are counted.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.hums: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+
+    async def _round_trip(self, name: str):
+        self.calls.append(name)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def reset(self):
+        self.users.clear()
+        self.hums.clear()
+        self.calls.clear()
+
+    def new_hum_id(self) -> str:
+        return uuid.uuid4().hex
+
+    async def get_user_profile(self, uid: str) -> Optional[Dict[str, Any]]:
+        await self._round_trip("get_user_profile")
+        return self.users.get(uid)
+
+    async def create_or_update_user(self, uid: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        await self._round_trip("create_or_update_user")
+        profile = self.users.setdefault(uid, {"totalHums": 0, "songsIdentified": 0})
+        profile.update(user_data)
+        return profile
+
+    async def create_hum_with_stats(
+        self,
+        hum_data: Dict[str, Any],
+        uid: str,
+        stat_increments: Dict[str, int],
+        hum_id: Optional[str] = None,
+    ) -> str:
+        await self._round_trip("create_hum_with_stats")
+        hum_id = hum_id or self.new_hum_id()
+        self.hums[hum_id] = hum_data
+        profile = self.users.setdefault(uid, {})
+        for stat, amount in stat_increments.items():
+            profile[stat] = profile.get(stat, 0) + amount
+        return hum_id
+
+    async def increment_user_stat(self, uid: str, stat_name: str, increment: int = 1):
+        await self._round_trip("increment_user_stat")
+        profile = self.users.setdefault(uid, {})
+        profile[stat_name] = profile.get(stat_name, 0) + increment
+
+
+class FakeFirestore:
+    """
+    An in-memory Firestore client covering the calls FirebaseService makes,
+    so the real service (with its caches and counter aggregation) can run
+    offline. Blocking calls sleep for `latency` seconds like a round-trip;
+    FirebaseService already runs them in threads.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.data: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.reads = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def collection(self, name: str) -> "FakeCollection":
+        return FakeCollection(self, name)
+
+    def batch(self) -> "FakeBatch":
+        return FakeBatch(self)
+
+    def _write(self, collection: str, doc_id: str, data: Dict[str, Any], merge: bool):
+        from firebase_admin import firestore
+
+        with self._lock:
+            self.writes += 1
+            current = dict(self.data[collection].get(doc_id, {})) if merge else {}
+            for key, value in data.items():
+                if isinstance(value, firestore.Increment):
+                    current[key] = current.get(key, 0) + value.value
+                elif value is firestore.SERVER_TIMESTAMP:
+                    current[key] = datetime.utcnow()
+                else:
+                    current[key] = value
+            self.data[collection][doc_id] = current
+
+    def _read(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self.reads += 1
+            doc = self.data[collection].get(doc_id)
+            return dict(doc) if doc is not None else None
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocument:
+    def __init__(self, db: FakeFirestore, collection: str, doc_id: Optional[str] = None):
+        self._db = db
+        self._collection = collection
+        self.id = doc_id or uuid.uuid4().hex[:20]
+
+    def get(self) -> FakeSnapshot:
+        self._db._round_trip()
+        return FakeSnapshot(self.id, self._db._read(self._collection, self.id))
+
+    def set(self, data: Dict[str, Any], merge: bool = False):
+        self._db._round_trip()
+        self._db._write(self._collection, self.id, data, merge)
+
+    def update(self, data: Dict[str, Any]):
+        self._db._round_trip()
+        if self._db._read(self._collection, self.id) is None:
+            raise KeyError(f"No document to update: {self._collection}/{self.id}")
+        self._db._write(self._collection, self.id, data, merge=True)
+
+
+class FakeCollection:
+    def __init__(self, db: FakeFirestore, name: str):
+        self._db = db
+        self._name = name
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocument:
+        return FakeDocument(self._db, self._name, doc_id)
+
+    def add(self, data: Dict[str, Any]) -> Tuple[datetime, FakeDocument]:
+        doc = self.document()
+        doc.set(data)
+        return datetime.utcnow(), doc
+
+
+class FakeBatch:
+    """Buffers writes and applies them all in one round-trip on commit()."""
+
+    def __init__(self, db: FakeFirestore):
+        self._db = db
+        self._writes: List[Tuple[FakeDocument, Dict[str, Any], bool]] = []
+
+    def set(self, doc: FakeDocument, data: Dict[str, Any], merge: bool = False):
+        self._writes.append((doc, data, merge))
+
+    def commit(self):
+        self._db._round_trip()
+        for doc, data, merge in self._writes:
+            self._db._write(doc._collection, doc.id, data, merge)
+
+
+def fake_token_claims(token: str) -> Dict[str, Any]:
+    """Treats the bearer token as the uid, e.g. `Authorization: Bearer user-1`."""
+    return {
+        "uid": token, "email": f"{token}@bench.local", "name": "Bench User",
+        "exp": time.time() + 3600,
+    }
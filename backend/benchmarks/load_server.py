@@ -0,0 +1,45 @@
+# In backend/benchmarks/load_server.py
+#
+# Runs the real app under uvicorn with Firestore and ID-token verification
+# replaced by in-memory fakes, for benchmarks.load_test. --firestore-backend
+# threaded puts a blocking fake behind the threaded backend (calls hold a
+# pool thread for the whole round-trip); memory awaits the round-trip on
+# the event loop, like the async backend. Everything else
+# (caches, transcoder pool, ACRCloud client) is the production code; point
+# it at a fake identify server with the usual ACRCLOUD_* settings.
+#
+#   cd backend && ACRCLOUD_HOST=127.0.0.1:9000 python -m benchmarks.load_server --port 8001
+
+import argparse
+
+import uvicorn
+from pydub import AudioSegment
+
+from app.config import settings
+from app.main import app
+from app.services.firebase_service import firebase_service
+from app.services.firestore_backend import MemoryBackend
+from app.services.song_matcher import song_matcher
+from benchmarks.fakes import FakeFirestore, fake_token_claims
+
+
+def main(args):
+    if args.firestore_backend == "memory":
+        firebase_service._store = MemoryBackend(settings.firestore_max_concurrency, latency=args.firestore_latency)
+    else:
+        firebase_service._db = FakeFirestore(latency=args.firestore_latency)
+    firebase_service._verify_id_token = fake_token_claims
+    # The fake identify server speaks plain HTTP
+    song_matcher.scheme = "http"
+    # api/hums.py points pydub at a developer's local ffmpeg.exe
+    AudioSegment.converter = args.ffmpeg
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hummify API with in-memory Firestore, for load tests")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg binary used for decoding and MP3 export")
+    parser.add_argument("--firestore-backend", choices=("threaded", "memory"), default="threaded")
+    parser.add_argument("--firestore-latency", type=float, default=0.02, help="simulated Firestore round-trip in seconds")
+    main(parser.parse_args())
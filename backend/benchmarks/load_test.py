@@ -0,0 +1,224 @@
+# In backend/benchmarks/load_test.py
+#
+# Offline load test of the API. Starts a fake ACRCloud identify server
+# (checking signatures) in this process and the real app with an in-memory
+# Firestore in a subprocess, then drives /upload-and-match and /remix with
+# the WAVs in static/uploads at rising concurrency. Reports throughput,
+# latency percentiles, status codes and the server's peak RSS per level.
+#
+#   cd backend && python -m benchmarks.load_test --concurrency 1,4,8,16 --requests 48
+
+import argparse
+import asyncio
+import glob
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+from app.services.storage_manager import UPLOADS_DIR, REMIX_PREFIX
+from benchmarks.fake_acrcloud import FakeACRCloudServer
+from benchmarks.stats import summarize, format_row
+
+ACCESS_KEY = "bench-key"
+ACCESS_SECRET = "bench-secret"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid: int) -> List[int]:
+    """pid and all of its descendants, from /proc."""
+    parents: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after ")" are safe
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(parents.get(current, []))
+    return tree
+
+
+def peak_rss_kb(pid: int) -> int:
+    """VmHWM (peak resident set size) of one process, in kB."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def reset_peak_rss(pid: int):
+    """Resets VmHWM to the current RSS (Linux 4.0+), so each level reports its own peak."""
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+async def wait_for_health(client: httpx.AsyncClient, base_url: str, server: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("load server exited during start-up")
+        try:
+            if (await client.get(f"{base_url}/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError("load server did not answer /health in time")
+
+
+def upload_request(i: int, wavs: List[bytes]) -> dict:
+    return {
+        "url": "/api/hums/upload-and-match",
+        "data": {"title": f"Load test {i}"},
+        "files": {"audio_file": ("hum.wav", wavs[i % len(wavs)], "audio/wav")},
+        "headers": {"Authorization": f"Bearer load-user-{i % 50}"},
+    }
+
+
+def remix_request(i: int, wavs: List[bytes]) -> dict:
+    # Mostly distinct settings, so the render cache is not all that is measured
+    rng = random.Random(i)
+    return {
+        "url": "/api/hums/remix",
+        "data": {
+            "pitch": str(rng.randint(-6, 6)), "speed": str(rng.choice((0.8, 1.0, 1.25))),
+            "echo": str(rng.choice((0, 20, 40))), "reverb": str(rng.choice((0, 30))),
+            "reverse": rng.choice(("true", "false")),
+        },
+        "files": {"audio_file": ("hum.wav", wavs[i % len(wavs)], "audio/wav")},
+    }
+
+
+SCENARIOS = {"upload": upload_request, "remix": remix_request}
+
+
+async def run_level(client: httpx.AsyncClient, base_url: str, build, wavs, requests: int, concurrency: int):
+    latencies, statuses = [], Counter()
+    next_index = iter(range(requests))
+
+    async def user():
+        for i in next_index:
+            request = build(i, wavs)
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    base_url + request["url"], data=request["data"],
+                    files=request["files"], headers=request.get("headers"),
+                )
+                statuses[response.status_code] += 1
+            except httpx.TransportError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def remove_new_remixes(since: float):
+    for path in glob.glob(os.path.join(UPLOADS_DIR, REMIX_PREFIX + "*")):
+        if os.path.getmtime(path) >= since:
+            os.remove(path)
+
+
+async def main(args):
+    wav_paths = sorted(glob.glob(os.path.join(UPLOADS_DIR, "*.wav")))
+    if not wav_paths:
+        raise SystemExit(f"No WAV files found in {UPLOADS_DIR}")
+    wavs = [open(path, "rb").read() for path in wav_paths]
+
+    acrcloud = FakeACRCloudServer(latency=args.acrcloud_latency, access_key=ACCESS_KEY, access_secret=ACCESS_SECRET)
+    await acrcloud.start()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "ACRCLOUD_HOST": acrcloud.address, "ACRCLOUD_ACCESS_KEY": ACCESS_KEY, "ACRCLOUD_ACCESS_SECRET": ACCESS_SECRET,
+        "MATCH_CACHE_ENABLED": "true" if args.match_cache else "false",
+        "LOG_REQUEST_TIMINGS": "false",
+        # Keep the sweeper away from the sample files and earlier remixes
+        "STORAGE_TTL_SECONDS": str(10 ** 9),
+    }
+    started_at = time.time()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load_server", "--port", str(port),
+         "--firestore-latency", str(args.firestore_latency), "--firestore-backend", args.firestore_backend,
+         "--ffmpeg", args.ffmpeg],
+        env=env, stdout=subprocess.DEVNULL if args.quiet else None,
+    )
+
+    try:
+        async with httpx.AsyncClient(timeout=120.0, limits=httpx.Limits(max_connections=256)) as client:
+            await wait_for_health(client, base_url, server)
+            print(f"{len(wavs)} sample files, ACRCloud latency {args.acrcloud_latency * 1000:.0f}ms, "
+                  f"Firestore latency {args.firestore_latency * 1000:.0f}ms ({args.firestore_backend})")
+
+            for scenario in args.scenarios.split(","):
+                build = SCENARIOS[scenario]
+                # One untimed request so worker start-up is not in the first level
+                await run_level(client, base_url, build, wavs, 1, 1)
+                for concurrency in (int(c) for c in args.concurrency.split(",")):
+                    for pid in process_tree(server.pid):
+                        reset_peak_rss(pid)
+                    acrcloud.reset_counters()
+
+                    latencies, statuses, elapsed = await run_level(
+                        client, base_url, build, wavs, args.requests, concurrency
+                    )
+                    tree = process_tree(server.pid)
+                    server_rss = peak_rss_kb(server.pid) / 1024
+                    workers_rss = sum(peak_rss_kb(pid) for pid in tree if pid != server.pid) / 1024
+
+                    print(format_row(f"{scenario} c={concurrency}", summarize(latencies)))
+                    print(f"{'':<24} throughput={len(latencies) / elapsed:.1f} req/s "
+                          f"status={dict(statuses)} peak_rss server={server_rss:.0f}MB "
+                          f"workers={workers_rss:.0f}MB identify_calls={acrcloud.requests} "
+                          f"bad_signatures={acrcloud.rejected}")
+    finally:
+        server.terminate()
+        server.wait()
+        await acrcloud.stop()
+        remove_new_remixes(started_at)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline load test of /upload-and-match and /remix")
+    parser.add_argument("--scenarios", default="upload,remix", help="comma-separated: " + ",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=48, help="requests per concurrency level")
+    parser.add_argument("--acrcloud-latency", type=float, default=0.3, help="fake identify latency in seconds")
+    parser.add_argument("--firestore-latency", type=float, default=0.02, help="simulated Firestore round-trip in seconds")
+    parser.add_argument("--firestore-backend", choices=("threaded", "memory"), default="threaded",
+                        help="memory models the async backend: round-trips do not hold a thread")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg binary for the server")
+    parser.add_argument("--quiet", action="store_true", help="hide the server's own output")
+    parser.add_argument("--match-cache", action="store_true", help="leave the match cache on (off by default)")
+    asyncio.run(main(parser.parse_args()))
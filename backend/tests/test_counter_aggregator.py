@@ -0,0 +1,55 @@
+# In backend/tests/test_counter_aggregator.py
+
+import asyncio
+
+from app.services.counter_aggregator import CounterAggregator
+
+
+def test_stop_waits_for_the_flush_in_flight():
+    written = []
+    write_started = None
+
+    async def write(deltas):
+        write_started.set()
+        await asyncio.sleep(0.05)
+        written.append(deltas)
+
+    async def scenario():
+        nonlocal write_started
+        write_started = asyncio.Event()
+        aggregator = CounterAggregator(write, interval_seconds=0.01, max_pending=100, batch_size=10)
+        aggregator.start()
+        aggregator.add("u1", "totalHums", 2)
+        await write_started.wait()
+        # The periodic flush is now inside write() with u1's deltas
+        aggregator.add("u2", "totalHums")
+        await aggregator.stop()
+        return aggregator
+
+    aggregator = asyncio.run(scenario())
+    assert written == [{"u1": {"totalHums": 2}}, {"u2": {"totalHums": 1}}]
+    assert aggregator.unflushed("u1") == {}
+    assert aggregator.pending == 0
+
+
+def test_failed_write_is_retried_on_stop():
+    attempts = []
+
+    async def write(deltas):
+        attempts.append(deltas)
+        if len(attempts) == 1:
+            raise RuntimeError("unavailable")
+
+    async def scenario():
+        aggregator = CounterAggregator(write, interval_seconds=60, max_pending=100, batch_size=10)
+        aggregator.start()
+        aggregator.add("u1", "songsIdentified")
+        await aggregator.flush()
+        assert aggregator.unflushed("u1") == {"songsIdentified": 1}
+        await aggregator.stop()
+        return aggregator
+
+    aggregator = asyncio.run(scenario())
+    assert attempts == [{"u1": {"songsIdentified": 1}}] * 2
+    assert aggregator.failures == 1
+    assert aggregator.pending == 0
@@ -0,0 +1,73 @@
+# In backend/tests/test_feed.py
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.firebase_service import FirebaseService, decode_feed_cursor, encode_feed_cursor, firebase_service
+from app.services.firestore_backend import MemoryBackend
+
+
+@pytest.fixture
+def service():
+    service = FirebaseService()
+    service._store = MemoryBackend(8)
+    hums = service._store.data["hums"]
+    for i in range(7):
+        hums[f"h{i}"] = {"title": f"Hum {i}", "isPublic": i != 3, "createdAt": f"2026-01-0{i + 1}T00:00:00", "likedBy": []}
+    # Same createdAt as h6; the ID breaks the tie
+    hums["h7"] = {"title": "Hum 7", "isPublic": True, "createdAt": "2026-01-07T00:00:00"}
+    return service
+
+
+def pages(service, limit):
+    cursor, result = None, []
+    while True:
+        page = asyncio.run(service.get_public_feed(limit, cursor))
+        result.append([hum["id"] for hum in page["hums"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return result
+
+
+@pytest.mark.parametrize("created_at", ["2026-01-07T00:00:00", datetime(2026, 1, 7, 12, 30)])
+def test_cursor_round_trip(created_at):
+    cursor = encode_feed_cursor(created_at, "h7")
+    assert "=" not in cursor
+    assert decode_feed_cursor(cursor) == [created_at, "h7"]
+
+
+# Not base64 JSON, an empty list, and a numeric hum ID
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyIyMDI2Iiw1XQ"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_feed_cursor(cursor)
+
+
+def test_pages_cover_public_hums_newest_first(service):
+    assert pages(service, 3) == [["h7", "h6", "h5"], ["h4", "h2", "h1"], ["h0"]]
+    # A last page that is exactly full is followed by an empty one
+    assert pages(service, 7) == [["h7", "h6", "h5", "h4", "h2", "h1", "h0"], []]
+
+
+def test_feed_cards_leave_out_likes_lists(service):
+    page = asyncio.run(service.get_public_feed(1))
+    assert "likedBy" not in page["hums"][0] and "isPublic" not in page["hums"][0]
+
+
+def test_cursor_past_the_end_gives_an_empty_page(service):
+    page = asyncio.run(service.get_public_feed(5, encode_feed_cursor("2025-12-31T00:00:00", "h0")))
+    assert page == {"hums": [], "next_cursor": None}
+
+
+def test_feed_endpoint_rejects_a_malformed_cursor(monkeypatch, service):
+    monkeypatch.setattr(firebase_service, "_store", service._store)
+    client = TestClient(app)
+
+    assert client.get("/api/hums/feed", params={"cursor": "not-a-cursor"}).status_code == 400
+    response = client.get("/api/hums/feed", params={"limit": 2})
+    assert response.status_code == 200
+    assert [hum["id"] for hum in response.json()["hums"]] == ["h7", "h6"]
@@ -0,0 +1,69 @@
+# In backend/tests/test_firebase_service.py
+
+import asyncio
+
+import pytest
+
+from app.services.firebase_service import FirebaseService
+from app.services.firestore_backend import MemoryBackend
+
+
+@pytest.fixture
+def service():
+    service = FirebaseService()
+    service._store = MemoryBackend(8)
+    return service
+
+
+def test_cached_absence_does_not_reset_counters(service):
+    # Cached as missing, then created and counted by another instance
+    service.profile_cache.set("u1", None)
+    service._store.data["users"]["u1"] = {"email": "a@x", "totalHums": 5, "songsIdentified": 2}
+
+    profile = asyncio.run(service.create_or_update_user(
+        "u1", {"email": "a@x", "totalHums": 0, "songsIdentified": 0, "lastLogin": "now"}
+    ))
+
+    stored = service._store.data["users"]["u1"]
+    assert (stored["totalHums"], stored["songsIdentified"], stored["lastLogin"]) == (5, 2, "now")
+    assert "createdAt" not in stored
+    assert (profile["totalHums"], profile["songsIdentified"]) == (5, 2)
+
+
+def test_profile_includes_unflushed_increments(service):
+    service._store.data["users"]["u1"] = {"totalHums": 5}
+    service.counters.add("u1", "totalHums", 2)
+
+    profile = asyncio.run(service.create_or_update_user("u1", {"lastLogin": "now"}))
+
+    assert profile["totalHums"] == 7
+    assert asyncio.run(service.get_user_profile("u1"))["totalHums"] == 7
+    # Nothing was written over the stored count
+    assert service._store.data["users"]["u1"]["totalHums"] == 5
+
+
+def test_new_profile_gets_default_counters(service):
+    service.counters.add("u2", "totalHums", 1)
+
+    profile = asyncio.run(service.create_or_update_user("u2", {"email": "b@x"}))
+
+    stored = service._store.data["users"]["u2"]
+    assert (stored["totalHums"], stored["songsIdentified"], stored["totalCommentsMade"]) == (0, 0, 0)
+    assert "createdAt" in stored
+    assert (profile["totalHums"], profile["songsIdentified"]) == (1, 0)
+
+
+def test_hums_and_stats_are_committed_together_by_default(service):
+    commits = []
+    commit = service._store.commit
+
+    async def record(writes):
+        commits.append([(collection, doc_id) for collection, doc_id, _, _ in writes])
+        await commit(writes)
+
+    service._store.commit = record
+    asyncio.run(service.create_hums_with_stats({"h1": {"title": "a"}, "h2": {"title": "b"}}, "u1", {"totalHums": 2}))
+
+    assert commits == [[("hums", "h1"), ("hums", "h2"), ("users", "u1")]]
+    assert service._store.data["users"]["u1"]["totalHums"] == 2
+    assert not service.counters.unflushed("u1")
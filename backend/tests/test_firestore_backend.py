@@ -0,0 +1,116 @@
+# In backend/tests/test_firestore_backend.py
+
+import asyncio
+import threading
+import time
+
+from app.services.firestore_backend import ThreadedBackend
+
+
+class FakeSnapshot:
+    exists = True
+
+    def __init__(self, data):
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeDocument:
+    def __init__(self, client, doc_id):
+        self.client = client
+        self.doc_id = doc_id
+
+    def get(self):
+        self.client.threads.append(threading.get_ident())
+        return FakeSnapshot({"id": self.doc_id})
+
+
+class FakeClient:
+    def __init__(self):
+        self.threads = []
+
+    def collection(self, name):
+        self.threads.append(threading.get_ident())
+        return self
+
+    def document(self, doc_id):
+        return FakeDocument(self, doc_id)
+
+
+def slow_client(seconds: float):
+    client = FakeClient()
+    created = []
+
+    def get_client():
+        # Stands in for initialize_app and firestore.client()
+        if not created:
+            time.sleep(seconds)
+            created.append(threading.get_ident())
+        return client
+
+    return client, created, get_client
+
+
+def test_client_is_created_and_used_off_the_loop():
+    client, created, get_client = slow_client(0.3)
+    backend = ThreadedBackend(get_client, 4)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        docs = await asyncio.gather(backend.get("users", "a"), backend.get("users", "b"))
+        ticker.cancel()
+
+        assert docs == [{"id": "a"}, {"id": "b"}]
+        # The loop kept running while the client was created
+        assert ticks >= 10
+        assert len(created) == 1 and loop_thread not in created + client.threads
+
+    asyncio.run(scenario())
+
+
+def test_calls_during_connect_share_it():
+    client, created, get_client = slow_client(0.2)
+    backend = ThreadedBackend(get_client, 4)
+
+    async def scenario():
+        warm_up = asyncio.create_task(backend.connect())
+        await asyncio.sleep(0)
+        assert await backend.get("users", "a") == {"id": "a"}
+        await warm_up
+
+    asyncio.run(scenario())
+    assert len(created) == 1
+
+
+def test_failed_connect_is_retried():
+    attempts = []
+    client = FakeClient()
+
+    def get_client():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("no credentials")
+        return client
+
+    backend = ThreadedBackend(get_client, 4)
+
+    async def scenario():
+        try:
+            await backend.get("users", "a")
+        except RuntimeError:
+            pass
+        return await backend.get("users", "a")
+
+    assert asyncio.run(scenario()) == {"id": "a"}
+    assert len(attempts) == 2
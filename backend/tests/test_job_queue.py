@@ -0,0 +1,59 @@
+# In backend/tests/test_job_queue.py
+
+import asyncio
+
+import pytest
+
+from app.services.job_queue import COMPLETED, FAILED, JobQueue
+
+
+async def sleep_then_return(seconds: float):
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def jobs():
+    jobs = JobQueue()
+    jobs.worker_count = 1
+    jobs.shutdown_timeout_seconds = 0.3
+    return jobs
+
+
+def test_stop_lets_jobs_finish_within_the_timeout(jobs):
+    async def scenario():
+        jobs.start()
+        running = jobs.submit("u1", sleep_then_return, 0.1)
+        queued = jobs.submit("u1", sleep_then_return, 0.1)
+        await asyncio.sleep(0)
+        await jobs.stop()
+        return running, queued
+
+    running, queued = asyncio.run(scenario())
+    assert (running.status, running.result) == (COMPLETED, 0.1)
+    assert (queued.status, queued.result) == (COMPLETED, 0.1)
+
+
+def test_stop_fails_jobs_left_after_the_timeout(jobs):
+    cleaned = []
+
+    async def scenario():
+        jobs.start()
+        running = jobs.submit("u1", sleep_then_return, 5, cleanup=lambda: cleaned.append("running"))
+        queued = jobs.submit("u1", sleep_then_return, 0, cleanup=lambda: cleaned.append("queued"))
+        await asyncio.sleep(0)
+
+        async def last_event():
+            snapshot = None
+            async for snapshot in jobs.watch(running, keepalive_seconds=10):
+                pass
+            return snapshot
+
+        watcher = asyncio.create_task(last_event())
+        await jobs.stop()
+        return running, queued, await asyncio.wait_for(watcher, 1)
+
+    running, queued, event = asyncio.run(scenario())
+    assert running.status == queued.status == FAILED
+    assert event["status"] == FAILED and event["error"] == "Server shutting down"
+    assert sorted(cleaned) == ["queued", "running"]
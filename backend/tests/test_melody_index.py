@@ -0,0 +1,101 @@
+# In backend/tests/test_melody_index.py
+
+import asyncio
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from app.config import settings
+from app.services import melody_index as mi
+from app.services.song_matcher import SongMatcher
+from app.services.transcoder import transcoder
+
+SR = mi.ANALYSIS_SAMPLE_RATE
+NOTE_SECONDS = 0.4
+
+
+def melody(seed: int, transpose: int = 0, notes: int = 60) -> np.ndarray:
+    """A random tune of sine notes between A3 and A5, shifted by `transpose` semitones."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(NOTE_SECONDS * SR)) / SR
+    envelope = np.minimum(1.0, np.minimum(t, t[::-1]) * 50)
+    pitches = 220.0 * 2 ** ((rng.integers(0, 24, notes) + transpose) / 12)
+    return np.concatenate([0.3 * envelope * np.sin(2 * np.pi * f * t) for f in pitches]).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def index():
+    songs = [{"title": f"Song {seed}"} for seed in range(3)]
+    return mi.MelodyIndex.from_sequences(songs, [mi.chroma_sequence(melody(seed), SR) for seed in range(3)])
+
+
+def excerpt(audio: np.ndarray, seconds: float = 6.0, start: float = 5.0) -> np.ndarray:
+    return audio[int(start * SR):int((start + seconds) * SR)]
+
+
+def top_confidence(index, audio: np.ndarray) -> float:
+    return index.search(mi.chroma_sequence(audio, SR))[0]["confidence"]
+
+
+def test_indexed_excerpt_matches(index):
+    result = index.search(mi.chroma_sequence(excerpt(melody(1)), SR))[0]
+    assert result["title"] == "Song 1"
+    assert result["confidence"] >= settings.local_match_threshold
+
+
+def test_transposed_excerpt_matches(index):
+    result = index.search(mi.chroma_sequence(excerpt(melody(2, transpose=2)), SR))[0]
+    assert result["title"] == "Song 2"
+    assert result["confidence"] >= settings.local_match_threshold
+
+
+@pytest.mark.parametrize("name", ["unindexed melody", "white noise", "steady tone"])
+def test_non_matching_audio_scores_below_threshold(index, name):
+    rng = np.random.default_rng(7)
+    samples = int(6 * SR)
+    audio = {
+        "unindexed melody": excerpt(melody(99)),
+        "white noise": (0.1 * rng.standard_normal(samples)).astype(np.float32),
+        "steady tone": (0.3 * np.sin(2 * np.pi * 440 * np.arange(samples) / SR)).astype(np.float32),
+    }[name]
+    assert top_confidence(index, audio) < settings.local_match_threshold
+
+
+def test_version_1_index_is_centred_on_load(index, tmp_path):
+    # Version 1 files stored the raw, non-negative chroma
+    raw = np.abs(index.features.astype(np.float32)) + 0.1
+    raw[~index.features.any(axis=1)] = 0
+    raw /= np.maximum(np.linalg.norm(raw, axis=1, keepdims=True), 1e-9)
+    path = tmp_path / "v1.npz"
+    np.savez(path, features=raw.astype(np.float16), offsets=index.offsets, songs=np.array(['{"title": "x"}'] * 3))
+
+    loaded = mi.MelodyIndex.load(str(path))
+    assert np.allclose(loaded.features.astype(np.float32).sum(axis=1), 0, atol=1e-2)
+
+
+def test_non_matching_query_falls_through_to_acrcloud(index, monkeypatch):
+    async def run_inline(func, *args):
+        return func(*args)
+
+    monkeypatch.setattr(transcoder, "run", run_inline)
+    monkeypatch.setattr(settings, "match_cache_enabled", False)
+
+    buffer = io.BytesIO()
+    sf.write(buffer, excerpt(melody(99)), SR, format="WAV")
+    remote = [{"title": "Remote", "confidence": 0.9, "source": "acrcloud"}]
+    calls = []
+
+    matcher = SongMatcher(host="acr.example", access_key="key", access_secret="secret")
+    matcher.mode = "local_first"
+    matcher.melody_index = index
+
+    async def identify(sample, filename, content_type):
+        calls.append(sample)
+        return remote
+
+    monkeypatch.setattr(matcher, "_identify", identify)
+
+    assert asyncio.run(matcher.match_hum_by_bytes(buffer.getvalue())) == remote
+    assert len(calls) == 1
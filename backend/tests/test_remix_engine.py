@@ -0,0 +1,55 @@
+# In backend/tests/test_remix_engine.py
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.remix_engine import apply_effects, render_remix
+
+SR = 8000
+
+
+def ramp(seconds: float) -> np.ndarray:
+    return np.linspace(-0.5, 0.5, int(seconds * SR), dtype=np.float32)[:, None]
+
+
+@pytest.mark.parametrize("params", [{"pitch": 13}, {"pitch": -13}, {"speed": 0.2}, {"speed": 4.5}, {"speed": 0}])
+def test_out_of_range_effects_are_rejected(params):
+    with pytest.raises(ValueError):
+        apply_effects(ramp(1), SR, params)
+
+
+def test_output_length_is_capped():
+    # -12 semitones at quarter speed would be 8x as long
+    rendered = apply_effects(ramp(10), SR, {"pitch": -12, "speed": 0.25}, max_seconds=30)
+    assert len(rendered) == 30 * SR
+
+
+def test_capped_reverse_starts_with_the_end():
+    samples = ramp(10)
+    rendered = apply_effects(samples, SR, {"reverse": True}, max_seconds=2)
+    assert len(rendered) == 2 * SR
+    assert np.allclose(rendered[:, 0], samples[::-1, 0][:2 * SR])
+
+
+@pytest.mark.parametrize("field, value", [("pitch", "24"), ("speed", "0.1"), ("speed", "10")])
+def test_remix_endpoint_rejects_out_of_range_effects(field, value):
+    response = TestClient(app).post(
+        "/api/hums/remix",
+        files={"audio_file": ("hum.wav", b"RIFF", "audio/wav")},
+        data={field: value},
+    )
+    assert response.status_code == 400
+
+
+def test_source_is_returned_only_within_the_budget(tmp_path):
+    source = tmp_path / "hum.wav"
+    sf.write(source, ramp(1)[:, 0], SR)
+    decoded_bytes = SR * 4
+
+    kept = render_remix(str(source), str(tmp_path / "a.wav"), {}, "wav", max_source_bytes=decoded_bytes)
+    assert kept["source"][0].nbytes == decoded_bytes
+    skipped = render_remix(str(source), str(tmp_path / "b.wav"), {}, "wav", max_source_bytes=decoded_bytes - 1)
+    assert "source" not in skipped
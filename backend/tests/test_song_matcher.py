@@ -0,0 +1,90 @@
+# In backend/tests/test_song_matcher.py
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.hum_pipeline import hum_pipeline
+from app.services.match_cache import match_cache
+from app.services.song_matcher import ACRCloudError, SongMatcher
+
+MATCH = {
+    "title": "Song", "artists": [{"name": "Artist"}], "album": {"name": "Album"},
+    "score": 90, "external_metadata": {},
+}
+
+
+def matcher_answering(monkeypatch, body):
+    matcher = SongMatcher(host="acr.example", access_key="key", access_secret="secret")
+
+    async def post_identify(sample, filename, content_type):
+        return httpx.Response(200, json=body, request=httpx.Request("POST", "https://acr.example/v1/identify"))
+
+    monkeypatch.setattr(matcher, "_post_identify", post_identify)
+    return matcher
+
+
+@pytest.fixture
+def cached(monkeypatch):
+    """Records every match_cache.set instead of storing it."""
+    stored = {}
+
+    async def get(key):
+        return None
+
+    async def set(key, matches):
+        stored[key] = matches
+
+    monkeypatch.setattr(settings, "match_cache_enabled", True)
+    monkeypatch.setattr(match_cache, "get", get)
+    monkeypatch.setattr(match_cache, "set", set)
+    return stored
+
+
+@pytest.mark.parametrize("code", [3001, 3003, 3014])
+def test_error_status_is_raised_and_not_cached(monkeypatch, cached, code):
+    matcher = matcher_answering(monkeypatch, {"status": {"code": code, "msg": "Error"}})
+
+    with pytest.raises(ACRCloudError) as error:
+        asyncio.run(matcher._identify(b"sample", "sample.wav", "audio/wav"))
+    assert error.value.code == code
+
+    identified = asyncio.run(matcher.identify_hum(b"sample", "hash"))
+    assert identified["matches"] == [] and str(code) in identified["error"]
+    assert cached == {}
+
+
+def test_no_result_is_cached(monkeypatch, cached):
+    matcher = matcher_answering(monkeypatch, {"status": {"code": 1001, "msg": "No result"}})
+
+    assert asyncio.run(matcher.identify_hum(b"sample", "hash")) == {"matches": [], "error": None}
+    assert cached == {"hash": []}
+
+
+def test_match_is_cached(monkeypatch, cached):
+    matcher = matcher_answering(monkeypatch, {"status": {"code": 0, "msg": "Success"}, "metadata": {"humming": [MATCH]}})
+
+    matches = asyncio.run(matcher.match_hum_by_bytes(b"sample", "hash"))
+    assert [match["title"] for match in matches] == ["Song"]
+    assert cached == {"hash": matches}
+
+
+def test_transport_error_is_reported(monkeypatch, cached):
+    matcher = SongMatcher(host="acr.example", access_key="key", access_secret="secret")
+
+    async def post_identify(sample, filename, content_type):
+        raise httpx.ConnectError("connection refused")
+
+    monkeypatch.setattr(matcher, "_post_identify", post_identify)
+    identified = asyncio.run(matcher.identify_hum(b"sample", "hash"))
+    assert identified == {"matches": [], "error": "connection refused"}
+    assert asyncio.run(matcher.match_hum_by_bytes(b"sample", "hash")) == []
+    assert cached == {}
+
+
+def test_failed_match_is_not_a_no_match():
+    user = {"uid": "u1", "name": "Ann"}
+    assert hum_pipeline.build_hum_data(user, "Hum", 44, [])["processingStatus"] == "no_match"
+    assert hum_pipeline.build_hum_data(user, "Hum", 44, [], "ACRCloud status 3001")["processingStatus"] == "failed"
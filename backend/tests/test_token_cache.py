@@ -0,0 +1,58 @@
+# In backend/tests/test_token_cache.py
+
+import asyncio
+import time
+
+from app.auth.token_cache import TokenCache
+from app.services.firebase_service import firebase_service
+
+
+def test_cancelled_leader_does_not_strand_waiters(monkeypatch):
+    calls = []
+
+    async def decode_token(token):
+        calls.append(token)
+        await asyncio.sleep(0.05)
+        return {"uid": "u1", "exp": time.time() + 3600}
+
+    monkeypatch.setattr(firebase_service, "decode_token", decode_token)
+
+    async def scenario():
+        cache = TokenCache()
+        leader = asyncio.create_task(cache.verify("token"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.verify("token"))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        user_info = await asyncio.wait_for(follower, timeout=1)
+        assert user_info["uid"] == "u1"
+        assert leader.cancelled()
+        assert calls == ["token"]
+        assert cache.stats()["coalesced"] == 1
+        # The shared verification finished and was cached
+        assert await cache.verify("token") == user_info
+        assert calls == ["token"]
+
+    asyncio.run(scenario())
+
+
+def test_failures_reach_every_waiter_and_are_not_cached(monkeypatch):
+    calls = []
+
+    async def decode_token(token):
+        calls.append(token)
+        await asyncio.sleep(0.01)
+        raise Exception("Invalid authentication token: expired")
+
+    monkeypatch.setattr(firebase_service, "decode_token", decode_token)
+
+    async def scenario():
+        cache = TokenCache()
+        results = await asyncio.gather(cache.verify("bad"), cache.verify("bad"), return_exceptions=True)
+        assert all("expired" in str(result) for result in results)
+        assert calls == ["bad"]
+        await asyncio.gather(cache.verify("bad"), return_exceptions=True)
+        assert calls == ["bad", "bad"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+# In backend/tests/test_transcoder.py
+
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from pydub import AudioSegment
+
+from app.services.transcoder import Transcoder, TranscoderBusy, prepare_identify_sample
+
+
+def sleep_for(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def crash():
+    os._exit(1)
+
+
+@pytest.fixture
+def transcoder():
+    transcoder = Transcoder()
+    transcoder.max_workers = 1
+    transcoder.max_queue = 0
+    yield transcoder
+    transcoder.shutdown()
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_job_ends(transcoder):
+    async def scenario():
+        # Start the pool so the job below begins running right away
+        await transcoder.run(sleep_for, 0)
+        job = asyncio.create_task(transcoder.run(sleep_for, 0.5))
+        await asyncio.sleep(0.2)
+        job.cancel()
+        await asyncio.sleep(0)
+
+        # The worker is still busy, so there is no capacity yet
+        with pytest.raises(TranscoderBusy):
+            await transcoder.run(sleep_for, 0)
+        await asyncio.sleep(0.5)
+        assert transcoder.stats()["in_flight"] == 0
+        assert await transcoder.run(sleep_for, 0) == 0
+
+    asyncio.run(scenario())
+
+
+def test_broken_pool_is_shut_down_and_replaced(transcoder):
+    async def scenario():
+        await transcoder.run(sleep_for, 0)
+        broken = transcoder._pool
+        shutdowns = []
+        shutdown = broken.shutdown
+        broken.shutdown = lambda **kwargs: shutdowns.append(kwargs) or shutdown(**kwargs)
+
+        with pytest.raises(BrokenProcessPool):
+            await transcoder.run(crash)
+        assert transcoder._pool is None
+        assert shutdowns == [{"wait": False, "cancel_futures": True}]
+        assert transcoder.stats()["in_flight"] == 0
+        assert await transcoder.run(sleep_for, 0) == 0
+
+    asyncio.run(scenario())
+
+
+def test_wav_size_matches_the_converted_file(tmp_path):
+    source = tmp_path / "hum.wav"
+    AudioSegment.silent(duration=1500, frame_rate=8000).set_channels(2).export(source, format="wav")
+    converted = tmp_path / "converted.wav"
+    AudioSegment.from_file(source).set_channels(1).set_frame_rate(44100).set_sample_width(2).export(converted, format="wav")
+
+    prepared = prepare_identify_sample(str(source), 10, 8000)
+    assert prepared["wav_size"] == os.path.getsize(converted)
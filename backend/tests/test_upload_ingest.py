@@ -0,0 +1,98 @@
+# In backend/tests/test_upload_ingest.py
+
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app, UploadSizeLimit
+from app.services.upload_ingest import spool_upload
+
+BOUNDARY = "hummify-test-boundary"
+
+
+def multipart_chunks(megabytes: int):
+    head = (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"audio_file\"; "
+        f"filename=\"hum.wav\"\r\nContent-Type: audio/wav\r\n\r\n"
+    ).encode()
+    return [head] + [b"\0" * 64 * 1024] * (16 * megabytes) + [f"\r\n--{BOUNDARY}--\r\n".encode()]
+
+
+def test_body_over_the_limit_is_rejected_while_streaming(monkeypatch):
+    monkeypatch.setattr(settings, "max_audio_size_mb", 1)
+    chunks = multipart_chunks(4)
+    received = []
+
+    async def receive():
+        received.append(chunks[len(received)])
+        return {"type": "http.request", "body": received[-1], "more_body": len(received) < len(chunks)}
+
+    async def send(message):
+        raise AssertionError("nothing should be sent before the body is rejected")
+
+    # No Content-Length: the limit can only be enforced while reading
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/api/hums/remix", "raw_path": b"/api/hums/remix", "root_path": "",
+        "query_string": b"", "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())],
+    }
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(UploadSizeLimit(app.router)(scope, receive, send))
+    assert error.value.status_code == 413
+    # 1 MB plus the multipart allowance, not the whole 4 MB body
+    assert len(received) <= 18
+
+
+def test_body_without_length_gets_413(monkeypatch):
+    monkeypatch.setattr(settings, "max_audio_size_mb", 1)
+    response = TestClient(app).post(
+        "/api/hums/remix", content=iter(multipart_chunks(2)),
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+    )
+    assert response.status_code == 413
+
+
+def test_declared_length_over_the_limit_is_rejected_up_front(monkeypatch):
+    monkeypatch.setattr(settings, "max_audio_size_mb", 1)
+    response = TestClient(app).post("/api/hums/remix", files={"audio_file": ("hum.wav", b"\0" * (2 << 20), "audio/wav")})
+    assert response.status_code == 413
+
+
+def spool(upload: UploadFile):
+    spooled = asyncio.run(spool_upload(upload))
+    with open(spooled.path, "rb") as f:
+        content = f.read()
+    spooled.cleanup()
+    return spooled, content
+
+
+def test_rolled_upload_is_adopted_without_reading_it(monkeypatch):
+    data = os.urandom(3 << 20)
+    file = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    file.write(data)
+    assert file._rolled
+    upload = UploadFile(file, filename="hum.wav")
+
+    async def no_reads(size=-1):
+        raise AssertionError("a rolled upload should not be read chunk by chunk")
+
+    monkeypatch.setattr(upload, "read", no_reads)
+    spooled, content = spool(upload)
+    assert content == data
+    assert spooled.size == len(data)
+    assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+
+
+def test_in_memory_upload_is_spooled():
+    data = b"RIFF" + os.urandom(1000)
+    spooled, content = spool(UploadFile(io.BytesIO(data), filename="hum.wav"))
+    assert content == data
+    assert spooled.sha256 == hashlib.sha256(data).hexdigest()
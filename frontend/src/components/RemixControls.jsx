@@ -1,9 +1,9 @@
 // In frontend/src/components/RemixControls.jsx
 
-import { RotateCcw, Wand2 } from 'lucide-react';
+import { Play, RotateCcw, Wand2 } from 'lucide-react';
 import { useState } from 'react';
 
-const RemixControls = ({ onRemix, isLoading }) => {
+const RemixControls = ({ onRemix, onPreview, isLoading }) => {
   const [controls, setControls] = useState({ pitch: 0, speed: 1, echo: 0, reverb: 0, reverse: false });
 
   const handleControlChange = (control, value) => {
@@ -18,6 +18,11 @@ const RemixControls = ({ onRemix, isLoading }) => {
     onRemix(controls);
   };
 
+  // Quick, short, lower-quality render while tweaking the sliders
+  const previewRemix = () => {
+    onPreview(controls);
+  };
+
   return (
     <div className="bg-white rounded-xl shadow-lg p-6">
       <div className="text-center mb-6">
@@ -50,6 +55,9 @@ const RemixControls = ({ onRemix, isLoading }) => {
 
       <div className="flex justify-center space-x-4 mb-6">
         <button onClick={resetControls} className="flex items-center space-x-2 px-4 py-2 bg-gray-600 hover:bg-gray-700 text-white rounded-lg transition-colors"><RotateCcw className="h-4 w-4" /><span>Reset</span></button>
+        {onPreview && (
+          <button onClick={previewRemix} disabled={isLoading} className="flex items-center space-x-2 px-4 py-2 bg-blue-600 hover:bg-blue-700 disabled:bg-gray-400 text-white rounded-lg transition-colors"><Play className="h-4 w-4" /><span>Preview</span></button>
+        )}
         <button onClick={applyRemix} disabled={isLoading} className="flex items-center space-x-2 px-6 py-2 bg-purple-600 hover:bg-purple-700 disabled:bg-gray-400 text-white rounded-lg transition-colors">
           {isLoading ? (<><div className="animate-spin rounded-full h-4 w-4 border-2 border-white border-t-transparent"></div><span>Processing...</span></>) : <><Wand2 className="h-5 w-5" /><span>Apply Remix</span></>}
         </button>
@@ -8,6 +8,7 @@ import { backendHumService } from '../services/backendHumService';
 const Remix = () => {
   const [selectedFile, setSelectedFile] = useState(null);
   const [remixedUrl, setRemixedUrl] = useState(null);
+  const [previewUrl, setPreviewUrl] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState('');
   const fileInputRef = useRef(null);
@@ -18,6 +19,7 @@ const Remix = () => {
       if (file.type.startsWith('audio/')) {
         setSelectedFile(file);
         setRemixedUrl(null);
+        setPreviewUrl(null);
         setError('');
       } else {
         setError('Please select a valid audio file');
@@ -40,6 +42,22 @@ const Remix = () => {
     }
   };
 
+  const handlePreview = async (remixParams) => {
+    if (!selectedFile) return;
+    setIsLoading(true);
+    setError('');
+    // A full remix already on screen would hide the new preview
+    setRemixedUrl(null);
+    try {
+      const result = await backendHumService.remixHum(selectedFile, { ...remixParams, preview: true });
+      setPreviewUrl(result.remixed_url);
+    } catch (error) {
+      setError(error.message || 'Preview failed');
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
   return (
     <div className="min-h-screen bg-gradient-to-br from-purple-50 to-blue-50 py-8">
       <div className="max-w-4xl mx-auto px-4 sm:px-6 lg:px-8">
@@ -63,7 +81,14 @@ const Remix = () => {
           </button>
         </div>
 
-        {selectedFile && <RemixControls onRemix={handleRemix} isLoading={isLoading} />}
+        {selectedFile && <RemixControls onRemix={handleRemix} onPreview={handlePreview} isLoading={isLoading} />}
+
+        {previewUrl && !remixedUrl && (
+          <div className="bg-white rounded-xl shadow-lg p-6 mt-8">
+            <h3 className="text-xl font-semibold text-gray-800 mb-4">Preview</h3>
+            <audio controls autoPlay src={previewUrl} className="w-full">Your browser does not support the audio element.</audio>
+          </div>
+        )}
 
         {remixedUrl && (
           <div className="bg-white rounded-xl shadow-lg p-6">